@@ -0,0 +1,79 @@
+import uuid
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+CATALOG_VERSION_KEY = 'titles:catalog:version'
+TAXONOMY_VERSION_KEY = 'titles:taxonomy:version'
+TITLE_VERSION_KEY = 'titles:{title_id}:version'
+
+
+def get_cache():
+    return caches[settings.TITLES_CACHE_ALIAS]
+
+
+def new_version():
+    """Новая версия — случайный идентификатор.
+
+    Версия не увеличивается, а заменяется новым значением: в файловом
+    кэше incr — это чтение и запись, и два одновременных писателя
+    получили бы одну и ту же версию. Случайные версии у каждой записи
+    свои, и если ключ версии вытеснен из кэша, новое значение всё
+    равно не совпадёт ни с одной прежней версией.
+    """
+    return uuid.uuid4().hex
+
+
+def get_version(key):
+    return get_cache().get_or_set(key, new_version, None)
+
+
+def bump_version(key):
+    get_cache().set(key, new_version(), None)
+
+
+def bump_versions(*keys):
+    """Сдвигает версии после коммита, чтобы не кэшировать старые данные."""
+    transaction.on_commit(lambda: [bump_version(key) for key in keys])
+
+
+def bump_title(title_id):
+    bump_versions(
+        CATALOG_VERSION_KEY, TITLE_VERSION_KEY.format(title_id=title_id)
+    )
+
+
+def bump_catalog():
+    bump_versions(CATALOG_VERSION_KEY)
+
+
+def bump_taxonomy():
+    bump_versions(CATALOG_VERSION_KEY, TAXONOMY_VERSION_KEY)
+
+
+def make_key(prefix, request, *versions):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values if value != ''
+    )
+    digest = md5(
+        repr((request.get_host(), request.path, params)).encode('utf-8')
+    ).hexdigest()
+    return ':'.join([prefix, *map(str, versions), digest])
+
+
+def title_list_key(request):
+    return make_key(
+        'titles:list', request, get_version(CATALOG_VERSION_KEY)
+    )
+
+
+def title_detail_key(request, title_id):
+    return make_key(
+        f'titles:detail:{title_id}', request,
+        get_version(TITLE_VERSION_KEY.format(title_id=title_id)),
+        get_version(TAXONOMY_VERSION_KEY),
+    )
@@ -1,6 +1,8 @@
 import django_filters as filters
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import search_reviews
 
 
 class TitleFilter(filters.FilterSet):
@@ -12,3 +14,25 @@ class TitleFilter(filters.FilterSet):
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+
+class ReviewSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по тексту отзывов: `?search=`.
+
+    Результаты отсортированы по релевантности, см. reviews.search.
+    Фильтр применяется только к списку: отзыв по адресу доступен и
+    изменяется независимо от параметров запроса.
+    """
+
+    search_param = 'search'
+
+    def get_search_terms(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, 'action', None) != 'list':
+            return queryset
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_reviews(queryset, terms)
@@ -1,13 +1,84 @@
+from django.conf import settings
+from rest_framework import status
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (CreateModelMixin, DestroyModelMixin,
                                    ListModelMixin)
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from .cache import get_cache
 from .permissions import IsAdmin, ReadOnly
+from .utils import plan_queryset
+
+
+class EagerLoadingMixin:
+    """Миксин, подгружающий связи, которые читает сериализатор.
+
+    План select_related/prefetch_related/only() строится по полям
+    сериализатора текущего действия и применяется в filter_queryset(),
+    поэтому работает и с переопределённым get_queryset().
+    """
+
+    def filter_queryset(self, queryset):
+        return self.eager_load(super().filter_queryset(queryset))
+
+    def eager_load(self, queryset):
+        plan = plan_queryset(self.get_serializer(), queryset.model)
+        # Поля курсора пагинатор читает у объектов, их нельзя откладывать.
+        ordering = getattr(self.paginator, 'ordering', ())
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        plan.only.update(field.lstrip('-') for field in ordering)
+        return plan.apply(
+            queryset, defer=self.request.method in SAFE_METHODS
+        )
+
+
+class VersionedCacheMixin:
+    """Миксин, кэширующий ответы list и retrieve.
+
+    Ключ включает нормализованные параметры запроса и версии данных,
+    которые сдвигаются сигналами при записи, поэтому устаревший ответ
+    не может быть отдан, а записи в кэше не нужно удалять явно.
+    """
+
+    cache_timeout = settings.TITLES_CACHE_TIMEOUT
+
+    def get_list_cache_key(self):
+        raise NotImplementedError
+
+    def get_detail_cache_key(self):
+        raise NotImplementedError
+
+    def cached_response(self, key, render):
+        cache = get_cache()
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = render()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            self.get_list_cache_key(),
+            lambda: super(VersionedCacheMixin, self).list(
+                request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            self.get_detail_cache_key(),
+            lambda: super(VersionedCacheMixin, self).retrieve(
+                request, *args, **kwargs)
+        )
 
 
 class CategoryGenreMixinViewSet(
+        EagerLoadingMixin,
         ListModelMixin,
         CreateModelMixin,
         DestroyModelMixin,
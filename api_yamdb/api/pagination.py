@@ -0,0 +1,264 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from hashlib import md5
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_cache
+
+
+class CountMixin:
+    """Миксин пагинатора с дешёвым подсчётом `count`.
+
+    Источники по порядку:
+    - `?count=none` — подсчёт отключён, в ответе `count: null`;
+    - `view.get_list_count()` — поддерживаемый счётчик, если view
+      может его дать для текущего запроса;
+    - `?count=estimated` — оценка планировщика PostgreSQL;
+    - точный COUNT(*), закэшированный по SQL запроса. Если view
+      отдаёт версию данных (`get_count_version()`), она входит в ключ и
+      число не устаревает, иначе кэш живёт LIST_COUNT_CACHE_TIMEOUT.
+    """
+
+    count_query_param = 'count'
+    count_disabled_values = ('none', 'false', '0')
+    count_cache_timeout = settings.LIST_COUNT_CACHE_TIMEOUT
+
+    def get_count(self, queryset, request, view):
+        mode = request.query_params.get(self.count_query_param, 'exact')
+        if mode.lower() in self.count_disabled_values:
+            return None
+        count = getattr(view, 'get_list_count', lambda: None)()
+        if count is not None:
+            return count
+        connection = connections[queryset.db]
+        if mode == 'estimated' and connection.vendor == 'postgresql':
+            return self.estimate_count(queryset, connection)
+        return self.cached_count(
+            queryset, getattr(view, 'get_count_version', lambda: None)()
+        )
+
+    @staticmethod
+    def estimate_count(queryset, connection):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def cached_count(self, queryset, version):
+        digest = md5(
+            repr(queryset.query.sql_with_params()).encode('utf-8')
+        ).hexdigest()
+        key = f'count:{queryset.model._meta.label_lower}:{version}:{digest}'
+        cache = get_cache()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(
+                key, count,
+                None if version is not None else self.count_cache_timeout
+            )
+        return count
+
+
+class KeysetPagination(CountMixin, BasePagination):
+    """Пагинация по ключу сортировки с непрозрачным курсором.
+
+    Сортировка задаётся кортежем `ordering` и должна заканчиваться
+    уникальным полем, поле с `-` идёт по убыванию. Страница по курсору
+    выбирается условием `(name, id) > (последнее name, последний id)`
+    по составному индексу, поэтому глубокие страницы стоят столько же,
+    сколько первая. Параметр `page` поддерживается для первых
+    `max_page_number` страниц, чтобы не ломать существующих клиентов.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    max_page_number = 10
+    ordering = ('name', 'id')
+    invalid_cursor_message = 'Неверный курсор.'
+    invalid_page_message = (
+        'Параметр page доступен для первых {max_page_number} страниц, '
+        'дальше используйте cursor.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count = self.get_count(queryset, request, view)
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), self.page_query_param
+        )
+        position = self.decode_cursor(request, queryset.model)
+        if position is None:
+            return self.paginate_by_page(queryset, request)
+        key, self.reverse = position
+        queryset = queryset.order_by(
+            *(self.reverse_field(field) if self.reverse else field
+              for field in self.ordering)
+        ).filter(self.keyset_filter(key, self.reverse))
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, True
+        self.page = results
+        return results
+
+    def paginate_by_page(self, queryset, request):
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        if not 1 <= number <= self.max_page_number:
+            raise NotFound(self.invalid_page_message.format(
+                max_page_number=self.max_page_number
+            ))
+        offset = (number - 1) * self.page_size
+        results = list(
+            queryset.order_by(*self.ordering)
+            [offset:offset + self.page_size + 1]
+        )
+        self.has_next = len(results) > self.page_size
+        self.has_previous = number > 1
+        self.page = results[:self.page_size]
+        return self.page
+
+    @staticmethod
+    def reverse_field(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def get_key_fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def keyset_filter(self, key, reverse):
+        """Условие «строго после ключа» в порядке сортировки.
+
+        Кроме раскрытого сравнения кортежей добавляется нестрогое
+        условие по первому полю: по нему планировщик берёт диапазон
+        индекса, не разбирая OR.
+        """
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') != reverse else 'gt'
+            equal = {
+                previous: key[previous]
+                for previous in self.get_key_fields()[:index]
+            }
+            condition |= Q(**equal, **{f'{name}__{lookup}': key[name]})
+            if index == 0:
+                first = Q(**{f'{name}__{lookup}e': key[name]})
+        return first & condition
+
+    def encode_cursor(self, obj, reverse):
+        key = {field: getattr(obj, field) for field in self.get_key_fields()}
+        key['_reverse'] = reverse
+        cursor = urlsafe_b64encode(json.dumps(
+            key, ensure_ascii=False, default=lambda value: value.isoformat()
+        ).encode('utf-8')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request, model):
+        """Ключ и направление из курсора, значения приводятся полями модели.
+
+        Испорченный курсор даёт 404, как несуществующая страница.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            key = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            reverse = bool(key.pop('_reverse'))
+            if set(key) != set(self.get_key_fields()):
+                raise ValueError
+            key = {
+                name: model._meta.get_field(name).to_python(value)
+                for name, value in key.items()
+            }
+        except (TypeError, ValueError, KeyError, AttributeError,
+                binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if any(value is None for value in key.values()):
+            raise NotFound(self.invalid_cursor_message)
+        return key, reverse
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True,
+                          'example': 123},
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+
+class FeedPagination(KeysetPagination):
+    """Лента отзывов или комментариев: сначала новые."""
+
+    ordering = ('-pub_date', '-id')
+
+
+class SearchPagination(PageNumberPagination):
+    """Постраничная выдача результатов поиска в порядке релевантности.
+
+    Релевантность вычисляется при запросе, курсор по ней не построить,
+    поэтому глубина выдачи ограничена `max_page_number` страницами.
+    """
+
+    max_page_number = 10
+    invalid_page_message = (
+        'Доступны первые {max_page_number} страниц результатов поиска, '
+        'уточните запрос.'
+    )
+
+    def get_page_number(self, request, paginator):
+        number = super().get_page_number(request, paginator)
+        try:
+            too_deep = int(number) > self.max_page_number
+        except ValueError:
+            too_deep = False
+        if too_deep:
+            raise NotFound(self.invalid_page_message.format(
+                max_page_number=self.max_page_number
+            ))
+        return number
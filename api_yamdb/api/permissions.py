@@ -15,6 +15,15 @@ class IsAdmin(permissions.BasePermission):
         )
 
 
+class IsModerator(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_moderator
+            or request.user.is_admin
+            or request.user.is_superuser
+        )
+
+
 class ReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.method in permissions.SAFE_METHODS
@@ -1,11 +1,42 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.forms import ValidationError
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
+from reviews.constants import MODERATION_MAX_IDS, SCORES
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
 
+class SparseFieldsMixin:
+    """Миксин, отбирающий поля ответа по параметрам запроса.
+
+    `?fields=a,b` оставляет только перечисленные поля, `?exclude=a,b`
+    убирает поля, `?include=a` добавляет поля из Meta.optional_fields.
+    Планировщик загрузки строит запрос по оставшимся полям, поэтому
+    лишние колонки, JOIN и prefetch не выполняются. Применяется только
+    к чтению, чтобы не терять поля при валидации записи.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            params = {}
+        else:
+            params = {
+                name: set(filter(None, request.query_params.get(
+                    name, '').split(',')))
+                for name in ('fields', 'exclude', 'include')
+            }
+        drop = set(getattr(self.Meta, 'optional_fields', ()))
+        drop -= params.get('include', set())
+        if params.get('fields'):
+            drop |= set(self.fields) - params['fields']
+        drop |= params.get('exclude', set())
+        for name in drop:
+            self.fields.pop(name, None)
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer пользователя."""
 
@@ -30,16 +61,45 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class ScoreHistogramField(serializers.Field):
+    """Гистограмма оценок произведения из сохранённых счётчиков."""
+
+    source_fields = tuple(Title.score_field(score) for score in SCORES)
+
+    def __init__(self, **kwargs):
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, title):
+        return {str(score): count
+                for score, count in title.score_histogram.items()}
+
+
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer()
     genre = GenreSerializer(many=True)
     rating = serializers.IntegerField(read_only=True)
+    reviews_count = serializers.IntegerField(source='review_count',
+                                             read_only=True)
+    score_histogram = ScoreHistogramField()
 
     class Meta:
         model = Title
-        fields = ('id', 'name', 'year', 'rating', 'description',
-                  'genre', 'category')
+        fields = ('id', 'name', 'year', 'rating', 'reviews_count',
+                  'description', 'genre', 'category', 'score_histogram')
         read_only_fields = ('genre', 'rating')
+        optional_fields = ('score_histogram',)
+
+
+class ScoreHistogramSerializer(serializers.ModelSerializer):
+    """Serializer гистограммы оценок произведения."""
+
+    review_count = serializers.IntegerField(read_only=True)
+    score_histogram = ScoreHistogramField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'review_count', 'score_histogram')
 
 
 class TitleCreateUpdateSerializer(serializers.ModelSerializer):
@@ -64,34 +124,109 @@ class TitleCreateUpdateSerializer(serializers.ModelSerializer):
         return serializer.data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Serializer одного произведения в пакетном создании.
+
+    Слаги проверяются по заранее загруженным словарям из контекста
+    (`categories`, `genres`), поэтому валидация не обращается к БД.
+    """
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField(),
+                                  allow_empty=False)
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'genre', 'category')
+
+    def validate_category(self, slug):
+        category = self.context['categories'].get(slug)
+        if category is None:
+            raise serializers.ValidationError(
+                f'Категория {slug} не найдена.')
+        return category
+
+    def validate_genre(self, slugs):
+        missing = [slug for slug in slugs
+                   if slug not in self.context['genres']]
+        if missing:
+            raise serializers.ValidationError(
+                f'Жанры не найдены: {", ".join(missing)}.')
+        return [self.context['genres'][slug] for slug in dict.fromkeys(slugs)]
+
+
+class BulkModerationSerializer(serializers.Serializer):
+    """Serializer запроса массового удаления отзывов и комментариев."""
+
+    reviews = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False,
+        max_length=MODERATION_MAX_IDS
+    )
+    comments = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False,
+        max_length=MODERATION_MAX_IDS
+    )
+    author = serializers.SlugRelatedField(
+        slug_field='username', queryset=User.objects.all(), required=False
+    )
+
+    def validate(self, data):
+        if not any(data.get(field) for field in self.fields):
+            raise serializers.ValidationError(
+                'Укажите reviews, comments или author.'
+            )
+        return data
+
+
+class LatestCommentsField(serializers.Field):
+    """Последние комментарии отзыва, загруженные view заранее.
+
+    view кладёт их в атрибут `latest_comments` одним оконным запросом
+    на всю страницу отзывов.
+    """
+
+    source_fields = ('id',)
+
+    def __init__(self, **kwargs):
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, review):
+        return CommentSerializer(
+            getattr(review, 'latest_comments', ()), many=True
+        ).data
+
+
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer отзывов."""
 
     author = serializers.CharField(source='author.username', read_only=True)
     score = serializers.IntegerField(validators=(MinValueValidator(1),
                                                  MaxValueValidator(10)))
+    comments = LatestCommentsField()
 
     class Meta:
         model = Review
-        fields = ['id', 'text', 'score', 'author', 'pub_date']
-        read_only_fields = ['author', 'pub_date']
+        fields = ['id', 'text', 'score', 'author', 'pub_date',
+                  'comments_count', 'comments']
+        read_only_fields = ['author', 'pub_date', 'comments_count']
+        optional_fields = ('comments',)
 
-    def validate(self, data):
-        """Проверка, что пользователь уже оставлял
-        отзыв на это произведение."""
-        request = self.context['request']
-        title_id = self.context['view'].kwargs.get('title_id')
+    # Повторный отзыв отсекает ограничение unique_review в БД,
+    # view переводит IntegrityError в ошибку с этим текстом.
+    default_error_messages = {
+        'duplicate': 'Вы уже оставили отзыв на это произведение.',
+    }
 
-        if request.method != 'POST':
-            return data
 
-        if Review.objects.filter(title_id=title_id,
-                                 author=request.user).exists():
-            raise ValidationError("Вы уже оставили отзыв на это произведение.")
-        return data
+class ReviewExportSerializer(ReviewSerializer):
+    """Serializer отзыва в выгрузке: всегда со всеми комментариями."""
+
+    class Meta(ReviewSerializer.Meta):
+        optional_fields = ()
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer комментариев."""
 
     author = serializers.SlugRelatedField(slug_field='username',
@@ -101,3 +236,33 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ['id', 'text', 'author', 'pub_date']
         read_only_fields = ['author', 'pub_date']
+
+
+class TitleBriefSerializer(serializers.ModelSerializer):
+    """Serializer названия произведения для лент пользователя."""
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name')
+
+
+class UserReviewSerializer(serializers.ModelSerializer):
+    """Serializer отзыва в ленте автора."""
+
+    title = TitleBriefSerializer(read_only=True)
+
+    class Meta:
+        model = Review
+        fields = ('id', 'title', 'text', 'score', 'pub_date',
+                  'comments_count')
+
+
+class UserCommentSerializer(serializers.ModelSerializer):
+    """Serializer комментария в ленте автора."""
+
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+    title = TitleBriefSerializer(source='review.title', read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ('id', 'review', 'title', 'text', 'pub_date')
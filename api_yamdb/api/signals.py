@@ -0,0 +1,55 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from reviews.signals import counters_active, ratings_recomputed
+
+from .cache import bump_catalog, bump_taxonomy, bump_title
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    bump_title(instance.pk)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def title_relation_changed(sender, instance, **kwargs):
+    bump_title(instance.title_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def title_review_changed(sender, instance, **kwargs):
+    # При массовом удалении версии сдвигает пересчёт рейтингов.
+    if counters_active():
+        bump_title(instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_title(instance.pk)
+    elif pk_set:
+        for title_id in pk_set:
+            bump_title(title_id)
+    else:
+        bump_catalog()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def taxonomy_changed(sender, instance, **kwargs):
+    bump_taxonomy()
+
+
+@receiver(ratings_recomputed)
+def ratings_changed(sender, title_ids, **kwargs):
+    for title_id in title_ids:
+        bump_title(title_id)
@@ -4,7 +4,7 @@ from rest_framework.routers import DefaultRouter
 from users.views import SignUpViewSet, TokenViewSet, UserViewSet
 
 from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet)
+                    ModerationViewSet, ReviewViewSet, TitleViewSet)
 
 app_name = 'api'
 
@@ -14,6 +14,7 @@ router_v1.register(r'titles', TitleViewSet, basename='titles')
 router_v1.register(r'categories', CategoryViewSet, basename='categories')
 router_v1.register(r'genres', GenreViewSet, basename='genres')
 router_v1.register(r'users', UserViewSet, basename='users')
+router_v1.register(r'moderation', ModerationViewSet, basename='moderation')
 router_v1.register(
     r'titles/(?P<title_id>\d+)/reviews',
     ReviewViewSet, basename='reviews'
@@ -24,6 +25,11 @@ router_v1.register(
 )
 
 urlpatterns = [
+    path(
+        'v1/titles/<int:title_id>/reviews/export.ndjson',
+        ReviewViewSet.as_view({'get': 'export'}),
+        name='reviews-export'
+    ),
     path('v1/', include(router_v1.urls)),
     path('v1/auth/token/', TokenViewSet.as_view(), name='token'),
     path('v1/auth/signup/', SignUpViewSet.as_view(), name='signup'),
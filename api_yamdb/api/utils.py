@@ -0,0 +1,115 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class QueryPlan:
+    """Набор select_related/prefetch_related/only для одного сериализатора."""
+
+    def __init__(self):
+        self.select = set()
+        self.prefetch = []
+        self.only = set()
+        self.only_safe = True
+
+    def apply(self, queryset, defer=True):
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch)
+        if defer and self.only_safe and self.only:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+
+def get_child(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.ManyRelatedField):
+        return field.child_relation
+    return field
+
+
+def plan_queryset(serializer, model, plan=None, prefix=''):
+    """Обходит поля сериализатора и собирает план загрузки для модели.
+
+    Прямые связи подтягиваются через select_related, обратные и
+    many-to-many — отдельным Prefetch с собственным планом для
+    вложенного сериализатора. Если источник поля не удаётся сопоставить
+    с полем модели (свойство, метод), only() не применяется.
+    """
+    plan = plan or QueryPlan()
+    for field in get_child(serializer).fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            plan_whole_object(field, model, plan, prefix)
+            continue
+        plan_field(field, model, plan, prefix)
+    return plan
+
+
+def plan_whole_object(field, model, plan, prefix):
+    """Поле с source='*' читает объект целиком.
+
+    Поле может перечислить нужные ему колонки в source_fields,
+    иначе only() для запроса отключается.
+    """
+    if isinstance(field, serializers.BaseSerializer):
+        plan_queryset(field, model, plan, prefix)
+        return
+    source_fields = getattr(field, 'source_fields', None)
+    if source_fields is None:
+        plan.only_safe = False
+        return
+    plan.only.update(f'{prefix}{name}' for name in source_fields)
+
+
+def plan_field(field, model, plan, prefix):
+    path = prefix
+    for index, attr in enumerate(field.source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            plan.only_safe = False
+            return
+        path = f'{path}{attr}'
+        is_last = index == len(field.source_attrs) - 1
+        if not model_field.is_relation:
+            plan.only.add(path)
+            return
+        if model_field.many_to_many or model_field.one_to_many:
+            plan.prefetch.append(Prefetch(path, queryset=plan_related(
+                get_child(field) if is_last else None, model_field
+            )))
+            return
+        plan.only.add(path)
+        if is_last and isinstance(
+                get_child(field), serializers.PrimaryKeyRelatedField):
+            return
+        plan.select.add(path)
+        model = model_field.related_model
+        if is_last:
+            plan_relation(get_child(field), model, plan, f'{path}__')
+            return
+        path = f'{path}__'
+
+
+def plan_relation(field, model, plan, prefix):
+    if isinstance(field, serializers.BaseSerializer):
+        plan_queryset(field, model, plan, prefix)
+    elif isinstance(field, serializers.SlugRelatedField):
+        plan.only.add(f'{prefix}{field.slug_field}')
+
+
+def plan_related(field, relation):
+    """Строит queryset для Prefetch по связи модели."""
+    model = relation.related_model
+    queryset = model._default_manager.all()
+    if field is None:
+        return queryset
+    plan = QueryPlan()
+    if relation.one_to_many:
+        plan.only.add(relation.field.attname)
+    plan_relation(field, model, plan, '')
+    return plan.apply(queryset)
@@ -1,16 +1,38 @@
-from django.db.models import Avg
+import json
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
 
+from reviews.leaderboards import (GLOBAL_SCOPE, category_scope, genre_scope,
+                                  leaderboard_titles)
+from reviews.constants import (COMMENTS_LIMIT, EXPORT_CHUNK_SIZE,
+                               MAX_COMMENTS_LIMIT)
 from reviews.models import Category, Comment, Genre, Review, Title
-from .filters import TitleFilter
-from .mixin import CategoryGenreMixinViewSet
-from .permissions import IsAdmin, ReadOnly, IsStuffOrReadOnly
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, ReviewSerializer,
+from reviews.utils import (bulk_create_titles, delete_review, delete_title,
+                           latest_comments, moderate_delete)
+from .cache import (CATALOG_VERSION_KEY, bump_catalog, get_version,
+                    title_detail_key, title_list_key)
+from .filters import ReviewSearchFilter, TitleFilter
+from .mixin import (CategoryGenreMixinViewSet, EagerLoadingMixin,
+                    VersionedCacheMixin)
+from .pagination import (FeedPagination, KeysetPagination,
+                         SearchPagination)
+from .permissions import IsAdmin, IsModerator, ReadOnly, IsStuffOrReadOnly
+from .serializers import (BulkModerationSerializer, CategorySerializer,
+                          CommentSerializer, GenreSerializer,
+                          ReviewExportSerializer, ReviewSerializer,
+                          ScoreHistogramSerializer,
+                          TitleBulkItemSerializer,
                           TitleCreateUpdateSerializer, TitleReadSerializer)
 
 
@@ -28,60 +50,321 @@ class GenreViewSet(CategoryGenreMixinViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('name')
+class TitleViewSet(VersionedCacheMixin, EagerLoadingMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.order_by('name', 'id')
     http_method_names = ['get', 'post', 'patch', 'delete']
     serializer_class = TitleReadSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
     permission_classes = (IsAdmin | ReadOnly,)
     filter_backends = (DjangoFilterBackend, SearchFilter)
     filterset_class = TitleFilter
+    bulk_max_items = 1000
 
     def get_serializer_class(self):
         if self.action in ('create', 'update', 'partial_update'):
             return TitleCreateUpdateSerializer
+        if self.action == 'score_histogram':
+            return ScoreHistogramSerializer
         return TitleReadSerializer
 
+    def get_list_cache_key(self):
+        return title_list_key(self.request)
+
+    def get_count_version(self):
+        return get_version(CATALOG_VERSION_KEY)
+
+    def get_detail_cache_key(self):
+        return title_detail_key(self.request, self.kwargs['pk'])
+
+    def perform_destroy(self, instance):
+        delete_title(instance)
+
+    def get_leaderboard_scope(self):
+        params = self.request.query_params
+        genre, category = params.get('genre'), params.get('category')
+        if genre and category:
+            raise ValidationError(
+                'Укажите либо genre, либо category, но не оба сразу.'
+            )
+        if genre:
+            return genre_scope(get_object_or_404(Genre, slug=genre).pk)
+        if category:
+            return category_scope(
+                get_object_or_404(Category, slug=category).pk
+            )
+        return GLOBAL_SCOPE
+
+    @action(detail=False)
+    def top(self, request):
+        def render():
+            titles = self.eager_load(
+                leaderboard_titles(self.get_leaderboard_scope())
+            )
+            return Response(self.get_serializer(titles, many=True).data)
+        return self.cached_response(self.get_list_cache_key(), render)
+
+    @staticmethod
+    def collect_slugs(items, field):
+        slugs = set()
+        for item in items:
+            value = item.get(field) if isinstance(item, dict) else None
+            values = value if isinstance(value, list) else [value]
+            slugs.update(slug for slug in values if isinstance(slug, str))
+        return slugs
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Пакетное создание произведений.
+
+        Слаги категорий и жанров всех элементов загружаются одним
+        запросом на модель, корректные элементы вставляются пакетно в
+        одной транзакции, ошибки возвращаются по индексам элементов.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError('Ожидается непустой список произведений.')
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                f'Не больше {self.bulk_max_items} произведений за запрос.'
+            )
+        context = {
+            'categories': Category.objects.in_bulk(
+                self.collect_slugs(items, 'category'), field_name='slug'),
+            'genres': Genre.objects.in_bulk(
+                self.collect_slugs(items, 'genre'), field_name='slug'),
+        }
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            serializer = TitleBulkItemSerializer(data=item, context=context)
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        created = []
+        if valid:
+            titles = bulk_create_titles(valid)
+            bump_catalog()
+            created = TitleReadSerializer(
+                self.eager_load(Title.objects.filter(
+                    pk__in=[title.pk for title in titles]).order_by('pk')),
+                many=True
+            ).data
+        return Response(
+            {'created': created, 'errors': errors},
+            status=(status.HTTP_201_CREATED if created
+                    else status.HTTP_400_BAD_REQUEST)
+        )
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(detail=True, url_path='score-histogram')
+    def score_histogram(self, request, pk=None):
+        return self.cached_response(
+            self.get_detail_cache_key(),
+            lambda: Response(self.get_serializer(self.get_object()).data)
+        )
+
+
+class ReviewViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """ViewSet отзывов."""
 
     serializer_class = ReviewSerializer
-    pagination_class = PageNumberPagination
+    filter_backends = (ReviewSearchFilter,)
     permission_classes = (IsStuffOrReadOnly,)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
-    # Метод проверки тайтла. Возвращает тайтл или 404
+    @property
+    def pagination_class(self):
+        """Лента по курсору, результаты поиска — по страницам."""
+        if ReviewSearchFilter().get_search_terms(self.request):
+            return SearchPagination
+        return FeedPagination
+
+    # Метод проверки тайтла. Возвращает тайтл или 404,
+    # загружает его не больше одного раза за запрос.
     def check_title(self):
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Title, id=title_id)
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
         title_id = self.check_title().pk
         return Review.objects.filter(title_id=title_id)
 
+    def get_list_count(self):
+        """Число отзывов из счётчика произведения вместо COUNT(*)."""
+        return self.check_title().review_count
+
+    def get_comments_limit(self):
+        value = self.request.query_params.get(
+            'comments_limit', COMMENTS_LIMIT
+        )
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= MAX_COMMENTS_LIMIT:
+            raise ValidationError({'comments_limit': [
+                f'Укажите целое число от 1 до {MAX_COMMENTS_LIMIT}.'
+            ]})
+        return limit
+
+    def attach_comments(self, reviews):
+        """Встраивает последние комментарии при `?include=comments`."""
+        if 'comments' not in self.get_serializer().fields:
+            return
+        comments = latest_comments(
+            [review.pk for review in reviews], self.get_comments_limit()
+        )
+        for review in reviews:
+            review.latest_comments = comments.get(review.pk, [])
+
+    def get_serializer_class(self):
+        if self.action == 'export':
+            return ReviewExportSerializer
+        return super().get_serializer_class()
+
+    def export(self, request, title_id=None):
+        """Все отзывы произведения с комментариями в формате NDJSON.
+
+        Отзывы с авторами читаются серверным курсором пачками по
+        EXPORT_CHUNK_SIZE, комментарии — одним запросом на пачку, и
+        каждая пачка сразу уходит клиенту: память не зависит от числа
+        отзывов.
+        """
+        title = self.check_title()
+        reviews = self.eager_load(
+            Review.objects.filter(title=title).order_by('pub_date', 'id')
+        )
+        response = StreamingHttpResponse(
+            self.export_lines(reviews), content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="title-{title.pk}-reviews.ndjson"'
+        )
+        return response
+
+    def export_lines(self, reviews):
+        chunk = []
+        for review in reviews.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            chunk.append(review)
+            if len(chunk) == EXPORT_CHUNK_SIZE:
+                yield self.export_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield self.export_chunk(chunk)
+
+    def export_chunk(self, reviews):
+        comments = defaultdict(list)
+        for comment in Comment.objects.filter(
+                review__in=reviews).select_related('author').order_by(
+                'review_id', 'pub_date', 'id'):
+            comments[comment.review_id].append(comment)
+        for review in reviews:
+            review.latest_comments = comments[review.pk]
+        return ''.join(
+            json.dumps(item, cls=JSONEncoder, ensure_ascii=False) + '\n'
+            for item in self.get_serializer(reviews, many=True).data
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.attach_comments(page)
+        return page
+
+    def get_object(self):
+        review = super().get_object()
+        self.attach_comments([review])
+        return review
+
     def perform_create(self, serializer):
+        """Создание отзыва без предварительной проверки на дубликат.
+
+        Повторный отзыв отсекает ограничение unique_review, вставка и
+        пересчёт оценок произведения сигналом post_save идут в одной
+        транзакции. Прочие нарушения целостности (например, в рейтингах
+        лучших) не выдаются за дубликат.
+        """
         title = self.check_title()
-        serializer.save(title=title, author=self.request.user)
+        try:
+            with transaction.atomic():
+                serializer.save(title=title, author=self.request.user)
+        except IntegrityError:
+            if not Review.objects.filter(
+                    title=title, author=self.request.user).exists():
+                raise
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                serializer.error_messages['duplicate']
+            ]})
+
+    def perform_update(self, serializer):
+        # Сдвиг оценок произведения делает post_save в той же транзакции.
+        with transaction.atomic():
+            serializer.save()
 
+    def perform_destroy(self, instance):
+        delete_review(instance)
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """ViewSet комментариев."""
 
     serializer_class = CommentSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = FeedPagination
     permission_classes = (IsStuffOrReadOnly,)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def check_review(self):
-        review_id = self.kwargs.get('review_id')
-        return get_object_or_404(Review, id=review_id)
+        """Отзыв из URL вместе с произведением одним запросом с JOIN.
+
+        Отзыв ищется по паре title_id/review_id, поэтому отзыв чужого
+        произведения даёт 404. Результат запоминается на время запроса.
+        """
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
 
     def get_queryset(self):
         review_id = self.check_review().pk
         return Comment.objects.filter(review_id=review_id)
 
+    def get_list_count(self):
+        """Число комментариев из счётчика отзыва вместо COUNT(*)."""
+        return self.check_review().comments_count
+
     def perform_create(self, serializer):
+        # Вставка и счётчик комментариев отзыва в одной транзакции.
         review = self.check_review()
-        serializer.save(review=review, author=self.request.user)
+        with transaction.atomic():
+            serializer.save(review=review, author=self.request.user)
+
+
+class ModerationViewSet(viewsets.GenericViewSet):
+    """ViewSet массовых действий модератора."""
+
+    serializer_class = BulkModerationSerializer
+    permission_classes = (IsModerator,)
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """Удаляет отзывы и комментарии по спискам id и/или автору.
+
+        Рейтинг и счётчики пересчитываются один раз на произведение,
+        в ответе — сводка удалённого.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        author = data.get('author')
+        summary = moderate_delete(
+            review_ids=data.get('reviews', ()),
+            comment_ids=data.get('comments', ()),
+            author_id=author.pk if author else None,
+        )
+        return Response(summary, status=status.HTTP_200_OK)
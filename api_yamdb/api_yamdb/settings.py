@@ -25,6 +25,8 @@ INSTALLED_APPS = [
     'api',
     'users',
     'reviews',
+    'jobs',
+    'mailer',
 ]
 
 MIDDLEWARE = [
@@ -69,6 +71,57 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Shared by all worker processes on the host: throttling,
+    # confirmation-code lockouts and cached JWT principals must not be
+    # per-process.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+    },
+    # Title pages and their version keys: a write in one process must
+    # invalidate pages cached by every other process.
+    'titles': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'titles'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+TITLES_CACHE_ALIAS = 'titles'
+TITLES_CACHE_TIMEOUT = 60 * 15
+LIST_COUNT_CACHE_TIMEOUT = 30
+AUTH_CACHE_ALIAS = 'shared'
+AUTH_CACHE_TIMEOUT = 60
+THROTTLE_CACHE_ALIAS = 'shared'
+
+
+# Background tasks
+
+TASKS_ALWAYS_EAGER = False
+TASKS_WORKER_THREADS = 4
+TASKS_POLL_INTERVAL = 1
+TASKS_VISIBILITY_TIMEOUT = 60 * 5
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_BACKOFF = 10
+TASKS_RETRY_BACKOFF_MAX = 60 * 60
+# Finished and failed jobs are kept this long, in seconds.
+TASKS_RETENTION = 60 * 60 * 24 * 7
+
+# Outgoing mail; retries use the TASKS_RETRY_BACKOFF schedule.
+
+MAIL_BATCH_SIZE = 100
+MAIL_MAX_ATTEMPTS = 5
+MAIL_VISIBILITY_TIMEOUT = 60 * 5
+# Sent and failed messages are kept this long, in seconds.
+MAIL_RETENTION = 60 * 60 * 24 * 7
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -113,13 +166,17 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_token': '30/minute',
+        'auth_signup': '30/minute',
+    },
 }
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'attempts', 'max_attempts',
+                    'run_at', 'locked_by', 'finished_at')
+    list_filter = ('status', 'task')
+    search_fields = ('task',)
+    readonly_fields = ('created_at', 'finished_at', 'last_error')
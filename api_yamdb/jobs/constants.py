@@ -0,0 +1,6 @@
+MAX_LENGTH_TASK_NAME = 200
+MAX_LENGTH_WORKER = 100
+MAX_LENGTH_STATUS = 16
+STRING_LENGTH_ERROR = 2000
+LOCK_RETRIES = 8
+LOCK_RETRY_DELAY = 0.01
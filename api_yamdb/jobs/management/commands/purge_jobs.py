@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from jobs.tasks import purge_finished_jobs
+
+
+class Command(BaseCommand):
+    help = ('Удаляет старые выполненные и упавшие задачи. '
+            'С --enqueue ставит задачу в очередь фоновых задач.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Не удалять сразу, а поставить задачу в очередь.'
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            purge_finished_jobs.delay()
+            self.stdout.write(self.style.SUCCESS(
+                'Задача очистки старых задач поставлена в очередь.'))
+            return
+        deleted = purge_finished_jobs()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено задач: {deleted}'))
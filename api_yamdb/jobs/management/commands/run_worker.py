@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Запускает обработчик очереди фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=settings.TASKS_WORKER_THREADS,
+            help='Количество потоков, выполняющих задачи.'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=settings.TASKS_POLL_INTERVAL,
+            help='Пауза между опросами пустой очереди, в секундах.'
+        )
+        parser.add_argument(
+            '--visibility-timeout', type=int,
+            default=settings.TASKS_VISIBILITY_TIMEOUT,
+            help='Время аренды задачи, в секундах: после него задачу '
+                 'может забрать другой обработчик.'
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Выйти, когда очередь опустеет.'
+        )
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            threads=options['threads'],
+            poll_interval=options['poll_interval'],
+            visibility_timeout=options['visibility_timeout'],
+        )
+        self.stdout.write(
+            f'Worker {worker.name}: потоков {worker.threads}')
+        try:
+            worker.run(burst=options['burst'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {worker.processed}, '
+            f'с ошибкой: {worker.failed}'))
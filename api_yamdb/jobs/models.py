@@ -0,0 +1,59 @@
+from django.db import models
+from django.utils import timezone
+
+from .constants import (MAX_LENGTH_STATUS, MAX_LENGTH_TASK_NAME,
+                        MAX_LENGTH_WORKER)
+
+
+class Job(models.Model):
+    """Model фоновой задачи в очереди.
+
+    Задачу может взять worker, если она ждёт (`pending`) и наступило
+    `run_at`, либо если её уже взяли (`running`), но аренда
+    `locked_until` истекла: обработчик упал, не завершив задачу.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    ]
+
+    task = models.CharField('Задача', max_length=MAX_LENGTH_TASK_NAME)
+    args = models.JSONField('Аргументы', default=list)
+    kwargs = models.JSONField('Именованные аргументы', default=dict)
+    status = models.CharField(
+        'Статус', max_length=MAX_LENGTH_STATUS, choices=STATUSES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField('Максимум попыток')
+    run_at = models.DateTimeField('Запустить не раньше', default=timezone.now)
+    locked_until = models.DateTimeField(
+        'Аренда до', null=True, blank=True
+    )
+    locked_by = models.CharField(
+        'Worker', max_length=MAX_LENGTH_WORKER, blank=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Создана', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершена', null=True, blank=True)
+
+    class Meta:
+        ordering = ('run_at', 'id')
+        indexes = [
+            models.Index(fields=['status', 'run_at', 'id'],
+                         name='job_status_run_at_idx'),
+            models.Index(fields=['status', 'locked_until'],
+                         name='job_status_locked_until_idx'),
+        ]
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+
+    def __str__(self):
+        return f'{self.task} #{self.pk} ({self.status})'
@@ -0,0 +1,190 @@
+"""Очередь фоновых задач в таблице Job, без внешнего брокера.
+
+Задача — функция, зарегистрированная декоратором `task`; `.delay()`
+кладёт вызов в очередь в транзакции вызывающего кода, поэтому worker
+увидит задачу только после коммита. Worker забирает задачи условным
+UPDATE: из нескольких обработчиков строку получает тот, чей UPDATE
+изменил её, — это работает и в SQLite без SELECT ... FOR UPDATE.
+Взятая задача арендуется на visibility timeout; если обработчик не
+завершил её за это время, задачу заберёт другой.
+"""
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .constants import LOCK_RETRIES, LOCK_RETRY_DELAY, STRING_LENGTH_ERROR
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class Task:
+    """Зарегистрированная фоновая задача."""
+
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<Task {self.name}>'
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self, args, kwargs)
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    Аргументы вызова сохраняются в JSON, поэтому передавайте id
+    объектов, а не сами объекты.
+    """
+    def register(func):
+        registered = Task(
+            func,
+            name or f'{func.__module__}.{func.__name__}',
+            max_attempts or settings.TASKS_MAX_ATTEMPTS,
+        )
+        registry[registered.name] = registered
+        return registered
+    return register(func) if func is not None else register
+
+
+def enqueue(task, args=(), kwargs=None, run_at=None):
+    """Ставит вызов задачи в очередь.
+
+    С TASKS_ALWAYS_EAGER задача выполняется сразу и ничего не
+    сохраняется — для тестов и локальной отладки.
+    """
+    kwargs = kwargs or {}
+    if settings.TASKS_ALWAYS_EAGER:
+        task(*args, **kwargs)
+        return None
+    return Job.objects.create(
+        task=task.name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=task.max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def is_pending(task):
+    """Ждёт ли в очереди вызов задачи, который worker может взять сейчас."""
+    return Job.objects.filter(
+        task=task.name, status=Job.PENDING, run_at__lte=timezone.now()
+    ).exists()
+
+
+def retrying(operation):
+    """Повторяет служебную запись очереди, если таблица заблокирована.
+
+    SQLite допускает одного писателя, и потоки worker могут кратко
+    ждать друг друга дольше busy timeout.
+    """
+    for attempt in range(LOCK_RETRIES):
+        try:
+            return operation()
+        except OperationalError:
+            if attempt == LOCK_RETRIES - 1:
+                raise
+            time.sleep(LOCK_RETRY_DELAY * 2 ** attempt)
+
+
+def available(now):
+    return (Q(status=Job.PENDING, run_at__lte=now)
+            | Q(status=Job.RUNNING, locked_until__lt=now))
+
+
+def claim_jobs(worker, limit, visibility_timeout):
+    """Забирает до limit готовых задач и арендует их за worker."""
+    now = timezone.now()
+    candidates = retrying(lambda: list(
+        Job.objects.filter(available(now)).order_by('run_at', 'id')
+        .values_list('pk', flat=True)[:limit]
+    ))
+    claimed = [
+        pk for pk in candidates
+        if retrying(lambda: Job.objects.filter(available(now), pk=pk).update(
+            status=Job.RUNNING,
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            attempts=F('attempts') + 1,
+        ))
+    ]
+    return retrying(
+        lambda: list(Job.objects.filter(pk__in=claimed, locked_by=worker))
+    )
+
+
+def retry_delay(attempts):
+    """Экспоненциальная пауза перед следующей попыткой, в секундах."""
+    return min(
+        settings.TASKS_RETRY_BACKOFF * 2 ** (attempts - 1),
+        settings.TASKS_RETRY_BACKOFF_MAX,
+    )
+
+
+def finish(job, **changes):
+    """Записывает результат, пока задача принадлежит этой попытке.
+
+    Если аренда истекла и задачу забрал другой worker, attempts уже
+    увеличен, и результат устаревшей попытки не запишется.
+    """
+    return retrying(lambda: Job.objects.filter(
+        pk=job.pk, locked_by=job.locked_by, attempts=job.attempts
+    ).update(locked_until=None, **changes))
+
+
+def run_job(job):
+    """Выполняет взятую задачу и записывает результат или повтор."""
+    registered = registry.get(job.task)
+    try:
+        if registered is None:
+            raise LookupError(f'Задача {job.task} не зарегистрирована.')
+        if job.attempts > job.max_attempts:
+            raise RuntimeError('Истекла аренда последней попытки.')
+        registered(*job.args, **job.kwargs)
+    except Exception:
+        error = traceback.format_exc()[-STRING_LENGTH_ERROR:]
+        logger.warning('Задача %s #%s упала:\n%s', job.task, job.pk, error)
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            finish(
+                job,
+                status=Job.PENDING,
+                run_at=now + timedelta(seconds=retry_delay(job.attempts)),
+                last_error=error,
+            )
+        else:
+            finish(job, status=Job.FAILED, last_error=error, finished_at=now)
+        return False
+    finish(job, status=Job.DONE, finished_at=timezone.now())
+    return True
+
+
+def purge_finished(older_than=None):
+    """Удаляет выполненные и упавшие задачи старше older_than секунд.
+
+    По умолчанию хранятся TASKS_RETENTION секунд; возвращает число
+    удалённых задач.
+    """
+    cutoff = timezone.now() - timedelta(
+        seconds=older_than or settings.TASKS_RETENTION
+    )
+    deleted, _ = Job.objects.filter(
+        status__in=(Job.DONE, Job.FAILED), finished_at__lt=cutoff
+    ).delete()
+    return deleted
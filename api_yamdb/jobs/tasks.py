@@ -0,0 +1,7 @@
+from .queue import purge_finished, task
+
+
+@task
+def purge_finished_jobs():
+    """Вычищает старые выполненные и упавшие задачи."""
+    return purge_finished()
@@ -0,0 +1,64 @@
+import logging
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import connections
+
+from .queue import claim_jobs, run_job
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Обработчик очереди с пулом потоков.
+
+    Главный поток забирает задачи, пока в пуле есть свободные потоки,
+    и ждёт завершения любой из выполняемых. С `burst` worker выходит,
+    когда очередь опустела.
+    """
+
+    def __init__(self, threads=None, poll_interval=None,
+                 visibility_timeout=None, name=None):
+        self.threads = threads or settings.TASKS_WORKER_THREADS
+        self.poll_interval = (
+            poll_interval or settings.TASKS_POLL_INTERVAL
+        )
+        self.visibility_timeout = (
+            visibility_timeout or settings.TASKS_VISIBILITY_TIMEOUT
+        )
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.processed = 0
+        self.failed = 0
+
+    def process(self, job):
+        try:
+            return run_job(job)
+        finally:
+            # У каждого потока своё соединение с БД.
+            connections.close_all()
+
+    def run(self, burst=False):
+        running = set()
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            while True:
+                free = self.threads - len(running)
+                jobs = claim_jobs(
+                    self.name, free, self.visibility_timeout
+                ) if free else []
+                running.update(pool.submit(self.process, job) for job in jobs)
+                if not running:
+                    if burst:
+                        return self.processed
+                    time.sleep(self.poll_interval)
+                    continue
+                done, running = wait(
+                    running, timeout=self.poll_interval,
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    self.processed += 1
+                    if not future.result():
+                        self.failed += 1
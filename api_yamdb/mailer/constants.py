@@ -0,0 +1,5 @@
+MAX_LENGTH_SUBJECT = 255
+MAX_LENGTH_EMAIL = 254
+MAX_LENGTH_STATUS = 16
+MAX_LENGTH_CLAIM = 64
+STRING_LENGTH_ERROR = 2000
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mailer.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из исходящей очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.MAIL_BATCH_SIZE,
+            help='Сколько писем отправлять через одно соединение.'
+        )
+
+    def handle(self, *args, **options):
+        sent, failed = deliver_pending(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {sent}, отложено или с ошибкой: {failed}'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from mailer.tasks import purge_sent_mail
+
+
+class Command(BaseCommand):
+    help = ('Удаляет старые отправленные и ошибочные письма. '
+            'С --enqueue ставит задачу в очередь фоновых задач.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Не удалять сразу, а поставить задачу в очередь.'
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            purge_sent_mail.delay()
+            self.stdout.write(self.style.SUCCESS(
+                'Задача очистки писем поставлена в очередь.'))
+            return
+        deleted = purge_sent_mail()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено писем: {deleted}'))
@@ -0,0 +1,68 @@
+from django.core.mail import EmailMessage
+from django.db import models
+from django.utils import timezone
+
+from .constants import (MAX_LENGTH_CLAIM, MAX_LENGTH_EMAIL,
+                        MAX_LENGTH_STATUS, MAX_LENGTH_SUBJECT)
+
+
+class OutboxMessage(models.Model):
+    """Model письма в исходящей очереди.
+
+    Письмо ждёт отправки (`pending`), пока не наступит `send_after`.
+    Отправитель арендует пачку писем (`sending`) до `locked_until`;
+    если он упал, не отметив результат, письма заберёт следующий.
+    """
+
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'Ожидает'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Ошибка'),
+    ]
+
+    subject = models.CharField('Тема', max_length=MAX_LENGTH_SUBJECT)
+    body = models.TextField('Текст')
+    from_email = models.EmailField(
+        'Отправитель', max_length=MAX_LENGTH_EMAIL, blank=True
+    )
+    to = models.JSONField('Получатели', default=list)
+    status = models.CharField(
+        'Статус', max_length=MAX_LENGTH_STATUS, choices=STATUSES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    send_after = models.DateTimeField(
+        'Отправить не раньше', default=timezone.now
+    )
+    locked_until = models.DateTimeField('Аренда до', null=True, blank=True)
+    locked_by = models.CharField(
+        'Отправитель пачки', max_length=MAX_LENGTH_CLAIM, blank=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        ordering = ('send_after', 'id')
+        indexes = [
+            models.Index(fields=['status', 'send_after', 'id'],
+                         name='outbox_status_send_after_idx'),
+            models.Index(fields=['status', 'locked_until'],
+                         name='outbox_status_locked_idx'),
+        ]
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.subject} → {", ".join(self.to)} ({self.status})'
+
+    def as_email(self, connection=None):
+        return EmailMessage(
+            self.subject, self.body, self.from_email or None, self.to,
+            connection=connection,
+        )
@@ -0,0 +1,189 @@
+"""Исходящая очередь писем в таблице OutboxMessage.
+
+`queue_mail` сохраняет письмо в транзакции вызывающего кода и после
+коммита ставит фоновую задачу доставки, так что SMTP не задерживает
+запрос.
+Доставка забирает готовые письма пачкой одним условным UPDATE и
+отправляет их через одно открытое соединение почтового бэкенда.
+Неудачное письмо откладывается с растущей паузой; после
+MAIL_MAX_ATTEMPTS попыток оно помечается как ошибочное. Текст
+отправленного или ошибочного письма стирается — в нём может быть код
+подтверждения, — а сами записи удаляет `purge_outbox`.
+"""
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from jobs.queue import is_pending, retry_delay, retrying
+
+from .constants import STRING_LENGTH_ERROR
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_delivery():
+    """Ставит задачу доставки, если в очереди нет ожидающей.
+
+    Вызывается после коммита письма: ожидающая задача ещё не забирала
+    письма и, когда worker её возьмёт, отправит и это.
+    """
+    from .tasks import deliver_outbox
+
+    if not is_pending(deliver_outbox):
+        deliver_outbox.delay()
+
+
+def queue_mail(subject, body, recipients, from_email=None):
+    """Кладёт письмо в исходящую очередь и планирует доставку."""
+    message = OutboxMessage.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipients),
+    )
+    transaction.on_commit(schedule_delivery)
+    return message
+
+
+def available(now):
+    return (Q(status=OutboxMessage.PENDING, send_after__lte=now)
+            | Q(status=OutboxMessage.SENDING, locked_until__lt=now))
+
+
+def claim_messages(limit, visibility_timeout):
+    """Арендует до limit готовых писем одним UPDATE.
+
+    Каждая пачка помечается своим идентификатором: письма, которые
+    между выборкой и UPDATE забрал другой отправитель, в неё не войдут.
+    """
+    now = timezone.now()
+    claim = uuid.uuid4().hex
+    candidates = retrying(lambda: list(
+        OutboxMessage.objects.filter(available(now))
+        .order_by('send_after', 'id').values_list('pk', flat=True)[:limit]
+    ))
+    if not candidates:
+        return []
+    retrying(lambda: OutboxMessage.objects.filter(
+        available(now), pk__in=candidates
+    ).update(
+        status=OutboxMessage.SENDING,
+        locked_by=claim,
+        locked_until=now + timedelta(seconds=visibility_timeout),
+        attempts=F('attempts') + 1,
+    ))
+    return retrying(lambda: list(
+        OutboxMessage.objects.filter(locked_by=claim).order_by('id')
+    ))
+
+
+def mark_failed(message, error, now):
+    """Откладывает письмо с экспоненциальной паузой или сдаётся."""
+    if message.attempts < settings.MAIL_MAX_ATTEMPTS:
+        changes = {
+            'status': OutboxMessage.PENDING,
+            'send_after': now + timedelta(
+                seconds=retry_delay(message.attempts)
+            ),
+        }
+    else:
+        changes = {'status': OutboxMessage.FAILED, 'body': ''}
+    retrying(lambda: OutboxMessage.objects.filter(
+        pk=message.pk, locked_by=message.locked_by
+    ).update(locked_until=None, last_error=error, **changes))
+
+
+def send_batch(messages):
+    """Отправляет пачку через одно соединение, возвращает число ошибок.
+
+    Письма уходят по одному в открытом соединении, чтобы отказ одного
+    адресата не помешал остальным и был записан именно этому письму.
+    """
+    connection = get_connection(fail_silently=False)
+    sent = []
+    failed = []
+    try:
+        connection.open()
+        for message in messages:
+            try:
+                connection.send_messages([message.as_email(connection)])
+            except Exception:
+                failed.append((message, traceback.format_exc()))
+            else:
+                sent.append(message.pk)
+    except Exception:
+        # Соединение не открылось или оборвалось: остаток пачки ждёт
+        # следующей попытки.
+        error = traceback.format_exc()
+        done = set(sent) | {message.pk for message, _ in failed}
+        failed.extend(
+            (message, error) for message in messages
+            if message.pk not in done
+        )
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            logger.warning('Не удалось закрыть почтовое соединение.')
+    now = timezone.now()
+    if sent:
+        retrying(lambda: OutboxMessage.objects.filter(
+            pk__in=sent, locked_by=messages[0].locked_by
+        ).update(
+            status=OutboxMessage.SENT, locked_until=None, sent_at=now,
+            body='',
+        ))
+    for message, error in failed:
+        logger.warning('Письмо #%s не отправлено:\n%s', message.pk, error)
+        mark_failed(message, error[-STRING_LENGTH_ERROR:], now)
+    return len(failed)
+
+
+def deliver_pending(batch_size=None, visibility_timeout=None):
+    """Отправляет готовые письма пачками, пока очередь не опустеет.
+
+    Возвращает (отправлено, с ошибкой). Письмо, отложенное после
+    ошибки, в этом проходе повторно не берётся.
+    """
+    batch_size = batch_size or settings.MAIL_BATCH_SIZE
+    visibility_timeout = (
+        visibility_timeout or settings.MAIL_VISIBILITY_TIMEOUT
+    )
+    total = failed = 0
+    while True:
+        messages = claim_messages(batch_size, visibility_timeout)
+        if not messages:
+            return total - failed, failed
+        total += len(messages)
+        failed += send_batch(messages)
+
+
+def next_retry_at():
+    """Время ближайшего отложенного письма или None."""
+    return OutboxMessage.objects.filter(
+        status=OutboxMessage.PENDING
+    ).aggregate(next_at=Min('send_after'))['next_at']
+
+
+def purge_outbox(older_than=None):
+    """Удаляет отправленные и ошибочные письма старше older_than секунд.
+
+    По умолчанию хранятся MAIL_RETENTION секунд; возвращает число
+    удалённых писем.
+    """
+    cutoff = timezone.now() - timedelta(
+        seconds=older_than or settings.MAIL_RETENTION
+    )
+    deleted, _ = OutboxMessage.objects.filter(
+        Q(status=OutboxMessage.SENT, sent_at__lt=cutoff)
+        | Q(status=OutboxMessage.FAILED, send_after__lt=cutoff)
+    ).delete()
+    return deleted
@@ -0,0 +1,18 @@
+from jobs.queue import enqueue, task
+
+from .outbox import deliver_pending, next_retry_at, purge_outbox
+
+
+@task
+def deliver_outbox():
+    """Отправляет исходящие письма и планирует повтор отложенных."""
+    sent, failed = deliver_pending()
+    if failed:
+        enqueue(deliver_outbox, run_at=next_retry_at())
+    return sent
+
+
+@task
+def purge_sent_mail():
+    """Вычищает старые отправленные и ошибочные письма."""
+    return purge_outbox()
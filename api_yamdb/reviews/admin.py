@@ -19,7 +19,8 @@ class GenreAdmin(admin.ModelAdmin):
 
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'year', 'category', 'description')
+    list_display = ('id', 'name', 'year', 'category', 'rating',
+                    'review_count', 'description')
     search_fields = ('name',)
     list_filter = ('year', 'category')
     raw_id_fields = ('category',)
@@ -34,7 +35,8 @@ class GenreTitleAdmin(admin.ModelAdmin):
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ('id', 'title', 'author', 'score', 'pub_date')
+    list_display = ('id', 'title', 'author', 'score', 'pub_date',
+                    'comments_count')
     search_fields = ('title', 'author')
     list_filter = ('score', 'pub_date')
 
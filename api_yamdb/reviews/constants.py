@@ -1,3 +1,15 @@
 STRING_LENGHT_TEXT = 40
 MAX_LENGHT_SLUG = 50
 MAX_LENGHT_NAME = 50
+RATING_CHUNK_SIZE = 500
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+LEADERBOARD_SIZE = 100
+LEADERBOARD_MIN_REVIEWS = 3
+MAX_LENGHT_SCOPE = 64
+COMMENTS_LIMIT = 3
+MAX_COMMENTS_LIMIT = 20
+MODERATION_CHUNK_SIZE = 500
+MODERATION_MAX_IDS = 1000
+EXPORT_CHUNK_SIZE = 500
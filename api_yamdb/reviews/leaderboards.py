@@ -0,0 +1,140 @@
+from django.db.models import Q
+
+from .constants import LEADERBOARD_MIN_REVIEWS, LEADERBOARD_SIZE
+from .models import Category, Genre, GenreTitle, LeaderboardEntry, Title
+
+GLOBAL_SCOPE = 'all'
+
+
+def category_scope(category_id):
+    return f'category:{category_id}'
+
+
+def genre_scope(genre_id):
+    return f'genre:{genre_id}'
+
+
+def scope_filter(scope):
+    """Условие на Title для произведений, входящих в рейтинг scope."""
+    if scope == GLOBAL_SCOPE:
+        return Q()
+    kind, object_id = scope.split(':')
+    if kind == 'category':
+        return Q(category_id=object_id)
+    return Q(genre_titles__genre_id=object_id)
+
+
+def title_scopes(title_id, category_id):
+    scopes = {GLOBAL_SCOPE}
+    if category_id:
+        scopes.add(category_scope(category_id))
+    scopes.update(
+        genre_scope(genre_id) for genre_id in GenreTitle.objects.filter(
+            title_id=title_id).values_list('genre_id', flat=True)
+    )
+    return scopes
+
+
+def qualified_titles(scope):
+    return Title.objects.filter(
+        scope_filter(scope), review_count__gte=LEADERBOARD_MIN_REVIEWS
+    ).order_by('-rating', 'id')
+
+
+def refill_scope(scope):
+    """Дополняет рейтинг лучшим произведением, которого в нём нет."""
+    entries = LeaderboardEntry.objects.filter(scope=scope)
+    if entries.count() >= LEADERBOARD_SIZE:
+        return
+    candidate = qualified_titles(scope).exclude(
+        pk__in=entries.values('title_id')
+    ).values('pk', 'rating').first()
+    if candidate:
+        LeaderboardEntry.objects.create(
+            scope=scope, title_id=candidate['pk'], rating=candidate['rating']
+        )
+
+
+def place_title(scope, title_id, rating):
+    """Ставит произведение на место в рейтинге scope или убирает его.
+
+    Если произведение уже было в рейтинге, его прежняя запись
+    удаляется, а освободившееся место занимает лучшее произведение вне
+    рейтинга: им может оказаться и само произведение с новой оценкой,
+    и то, что после понижения оценки его обогнало.
+    """
+    entries = LeaderboardEntry.objects.filter(scope=scope)
+    removed, _ = entries.filter(title_id=title_id).delete()
+    if removed:
+        refill_scope(scope)
+        return
+    if rating is None:
+        return
+    last = entries.order_by('rating', '-title_id').first()
+    is_full = entries.count() >= LEADERBOARD_SIZE
+    if not is_full or (-rating, title_id) < (-last.rating, last.title_id):
+        LeaderboardEntry.objects.create(
+            scope=scope, title_id=title_id, rating=rating
+        )
+        if is_full:
+            last.delete()
+
+
+def refresh_title_leaderboards(title_id):
+    """Обновляет рейтинги, в которые входит или входило произведение.
+
+    Вызывается после изменения оценок, категории или жанров
+    произведения. Каждый рейтинг хранит не больше LEADERBOARD_SIZE
+    записей, поэтому работа не зависит от числа произведений, а для
+    произведений вне рейтингов и ниже порога отзывов сводится к двум
+    чтениям.
+    """
+    entries = set(LeaderboardEntry.objects.filter(
+        title_id=title_id).order_by().values_list('scope', flat=True))
+    title = Title.objects.filter(pk=title_id).values(
+        'category_id', 'review_count', 'rating'
+    ).first()
+    qualifies = (
+        title is not None
+        and title['review_count'] >= LEADERBOARD_MIN_REVIEWS
+    )
+    if not qualifies and not entries:
+        return
+    scopes = (
+        title_scopes(title_id, title['category_id']) if title else set()
+    )
+    for scope in entries - scopes:
+        LeaderboardEntry.objects.filter(
+            scope=scope, title_id=title_id).delete()
+        refill_scope(scope)
+    for scope in scopes:
+        place_title(scope, title_id, title['rating'] if qualifies else None)
+
+
+def leaderboard_titles(scope):
+    """Произведения рейтинга scope в порядке мест."""
+    return Title.objects.filter(leaderboard_entries__scope=scope).order_by(
+        '-leaderboard_entries__rating', 'leaderboard_entries__title_id'
+    )
+
+
+def rebuild_scope(scope):
+    LeaderboardEntry.objects.filter(scope=scope).delete()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(scope=scope, title_id=pk, rating=rating)
+        for pk, rating in qualified_titles(scope).values_list(
+            'pk', 'rating')[:LEADERBOARD_SIZE]
+    )
+
+
+def rebuild_leaderboards():
+    """Пересобирает все рейтинги по сохранённым оценкам произведений."""
+    scopes = [GLOBAL_SCOPE]
+    scopes += [category_scope(pk)
+               for pk in Category.objects.values_list('pk', flat=True)]
+    scopes += [genre_scope(pk)
+               for pk in Genre.objects.values_list('pk', flat=True)]
+    LeaderboardEntry.objects.exclude(scope__in=scopes).delete()
+    for scope in scopes:
+        rebuild_scope(scope)
+    return len(scopes)
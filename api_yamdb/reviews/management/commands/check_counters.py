@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.constants import RATING_CHUNK_SIZE
+from reviews.models import Review, Title
+from reviews.utils import (iter_pk_chunks, repair_comment_counts,
+                           repair_review_counts)
+
+
+class Command(BaseCommand):
+    help = ('Сверяет счётчики отзывов произведений и комментариев отзывов '
+            'с данными пачками и исправляет расхождения.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=RATING_CHUNK_SIZE,
+            help='Количество строк в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        titles = 0
+        for chunk in iter_pk_chunks(Title.objects.all(), chunk_size):
+            with transaction.atomic():
+                titles += repair_review_counts(chunk)
+        reviews = 0
+        for chunk in iter_pk_chunks(Review.objects.all(), chunk_size):
+            with transaction.atomic():
+                reviews += repair_comment_counts(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено счётчиков: произведений — {titles}, '
+            f'отзывов — {reviews}'))
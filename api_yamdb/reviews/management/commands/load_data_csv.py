@@ -2,6 +2,7 @@ import csv
 import os
 
 from django.conf import settings
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.db import IntegrityError
 
@@ -167,6 +168,8 @@ class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         for csv_file, create_function in TABLES.items():
             self.load_csv_to_db(create_function, csv_file)
+        call_command('recompute_ratings', stdout=self.stdout)
+        call_command('check_counters', stdout=self.stdout)
 
     def load_csv_to_db(self, create_function, csv_file):
         csv_file_path = os.path.join(
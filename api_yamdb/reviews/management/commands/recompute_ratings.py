@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.constants import RATING_CHUNK_SIZE
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.utils import iter_title_id_chunks, recompute_title_ratings
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохранённый рейтинг и гистограмму оценок '
+            'произведений пачками и пересобирает рейтинги лучших.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=RATING_CHUNK_SIZE,
+            help='Количество произведений в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for chunk in iter_title_id_chunks(options['chunk_size']):
+            with transaction.atomic():
+                total += recompute_title_ratings(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {total} произведений'))
+        with transaction.atomic():
+            scopes = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересобрано рейтингов лучших: {scopes}'))
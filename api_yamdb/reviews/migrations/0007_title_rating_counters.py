@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 17:06
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_title_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    stats = (
+        Review.objects.order_by().values('title_id')
+        .annotate(score_sum=Sum('score'), review_count=Count('id'))
+    )
+    for row in stats.iterator():
+        Title.objects.filter(pk=row['title_id']).update(
+            score_sum=row['score_sum'],
+            review_count=row['review_count'],
+            rating=row['score_sum'] / row['review_count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_alter_review_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 3.2 on 2026-10-18 17:13
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_score_histograms(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    stats = (
+        Review.objects.order_by().values('title_id', 'score')
+        .annotate(reviews=Count('id'))
+    )
+    for row in stats.iterator():
+        Title.objects.filter(pk=row['title_id']).update(
+            **{f'score_{row["score"]}': row['reviews']}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='score_1',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 1'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_10',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 10'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_2',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 2'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_3',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 3'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_4',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 4'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_5',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 5'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_6',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 6'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_7',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 7'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_8',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 8'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_9',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Отзывов с оценкой 9'),
+        ),
+        migrations.RunPython(fill_score_histograms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2 on 2026-10-18 17:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=64, verbose_name='Область')),
+                ('rating', models.FloatField(verbose_name='Рейтинг произведения')),
+                ('title', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='leaderboard_entries', to='reviews.title')),
+            ],
+            options={
+                'verbose_name': 'Позиция в рейтинге',
+                'verbose_name_plural': 'Рейтинги произведений',
+                'ordering': ('scope', '-rating', 'title_id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['scope', '-rating', 'title'], name='leaderboard_scope_rating_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('scope', 'title'), name='unique_leaderboard_title'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 17:28
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_comments_count(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    stats = (
+        Comment.objects.order_by().values('review_id')
+        .annotate(comments_count=Count('id'))
+    )
+    for row in stats.iterator():
+        Review.objects.filter(pk=row['review_id']).update(
+            comments_count=row['comments_count']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_leaderboard_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
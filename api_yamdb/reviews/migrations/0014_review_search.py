@@ -0,0 +1,60 @@
+from django.db import migrations
+
+FTS_TABLE = 'reviews_review_fts'
+SEARCH_CONFIG = 'russian'
+
+# Триггеры живут на таблице reviews_review: если миграция SQLite
+# пересоздаст её (например, при изменении поля), их нужно создать заново.
+SQLITE_CREATE = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"text, content='reviews_review', content_rowid='id', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON reviews_review BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON reviews_review BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF text ON reviews_review "
+    f"BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+SQLITE_DROP = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+# Выражение совпадает с тем, что строит SearchVector('text', config=...).
+POSTGRESQL_CREATE = (
+    f"CREATE INDEX review_text_search_idx ON reviews_review USING gin "
+    f"(to_tsvector('{SEARCH_CONFIG}'::regconfig, COALESCE(text, '')))",
+)
+POSTGRESQL_DROP = (
+    'DROP INDEX IF EXISTS review_text_search_idx',
+)
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_feed_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_CREATE,
+                            'postgresql': POSTGRESQL_CREATE}),
+            run_for_vendor({'sqlite': SQLITE_DROP,
+                            'postgresql': POSTGRESQL_DROP}),
+        ),
+    ]
@@ -2,7 +2,8 @@ from django.db import models
 
 from users.models import User
 
-from .constants import MAX_LENGHT_NAME, MAX_LENGHT_SLUG, STRING_LENGHT_TEXT
+from .constants import (MAX_LENGHT_NAME, MAX_LENGHT_SCOPE, MAX_LENGHT_SLUG,
+                        SCORES, STRING_LENGHT_TEXT)
 from .validators import validate_year
 
 
@@ -77,15 +78,133 @@ class Title(models.Model):
         Genre,
         through='GenreTitle'
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    # Гистограмма оценок: по счётчику отзывов на каждую оценку.
+    score_1 = models.PositiveIntegerField(
+        'Отзывов с оценкой 1',
+        default=0,
+        editable=False
+    )
+    score_2 = models.PositiveIntegerField(
+        'Отзывов с оценкой 2',
+        default=0,
+        editable=False
+    )
+    score_3 = models.PositiveIntegerField(
+        'Отзывов с оценкой 3',
+        default=0,
+        editable=False
+    )
+    score_4 = models.PositiveIntegerField(
+        'Отзывов с оценкой 4',
+        default=0,
+        editable=False
+    )
+    score_5 = models.PositiveIntegerField(
+        'Отзывов с оценкой 5',
+        default=0,
+        editable=False
+    )
+    score_6 = models.PositiveIntegerField(
+        'Отзывов с оценкой 6',
+        default=0,
+        editable=False
+    )
+    score_7 = models.PositiveIntegerField(
+        'Отзывов с оценкой 7',
+        default=0,
+        editable=False
+    )
+    score_8 = models.PositiveIntegerField(
+        'Отзывов с оценкой 8',
+        default=0,
+        editable=False
+    )
+    score_9 = models.PositiveIntegerField(
+        'Отзывов с оценкой 9',
+        default=0,
+        editable=False
+    )
+    score_10 = models.PositiveIntegerField(
+        'Отзывов с оценкой 10',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+            models.Index(fields=['year', 'name', 'id'],
+                         name='title_year_name_idx'),
+            models.Index(fields=['category', 'name', 'id'],
+                         name='title_category_name_idx'),
+        ]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
     def __str__(self):
         return f'{self.name[:STRING_LENGHT_TEXT]} - {self.year}'
 
+    @staticmethod
+    def score_field(score):
+        return f'score_{score}'
+
+    @property
+    def score_histogram(self):
+        return {
+            score: getattr(self, self.score_field(score)) for score in SCORES
+        }
+
+
+class LeaderboardEntry(models.Model):
+    """Model позиции в рейтинге лучших произведений.
+
+    scope — 'all', 'category:<id>' или 'genre:<id>'. Внешний ключ без
+    ограничения в БД: записи удалённых произведений убираются сигналом
+    вместе с дозаполнением рейтинга.
+    """
+
+    scope = models.CharField('Область', max_length=MAX_LENGHT_SCOPE)
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='leaderboard_entries'
+    )
+    rating = models.FloatField('Рейтинг произведения')
+
+    class Meta:
+        ordering = ('scope', '-rating', 'title_id')
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'title'],
+                                    name='unique_leaderboard_title')
+        ]
+        indexes = [
+            models.Index(fields=['scope', '-rating', 'title'],
+                         name='leaderboard_scope_rating_idx'),
+        ]
+        verbose_name = 'Позиция в рейтинге'
+        verbose_name_plural = 'Рейтинги произведений'
+
+    def __str__(self):
+        return f'{self.scope} - {self.title_id}'
+
 
 class GenreTitle(models.Model):
     """Model жанр-произведение."""
@@ -107,6 +226,10 @@ class GenreTitle(models.Model):
                 fields=['title_id', 'genre_id'],
                 name='unique_genre_title')
         ]
+        indexes = [
+            models.Index(fields=['genre', 'title'],
+                         name='genretitle_genre_title_idx'),
+        ]
         verbose_name = 'Жанр-Произведение'
         verbose_name_plural = 'Жанры-Произведения'
 
@@ -123,6 +246,11 @@ class Review(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     score = models.PositiveSmallIntegerField()
     pub_date = models.DateTimeField(auto_now_add=True)
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ('-pub_date',)
@@ -130,12 +258,36 @@ class Review(models.Model):
             models.UniqueConstraint(fields=['title', 'author'],
                                     name='unique_review')
         ]
+        indexes = [
+            models.Index(fields=['title', 'pub_date', 'id'],
+                         name='review_title_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date', 'id'],
+                         name='review_author_pub_date_idx'),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
     def __str__(self):
         return self.text[:STRING_LENGHT_TEXT]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        if not review.get_deferred_fields() & {'title_id', 'score'}:
+            review._loaded_score = (review.title_id, review.score)
+        return review
+
+    def save(self, *args, **kwargs):
+        """Сохранение с запоминанием оценки для счётчиков произведения.
+
+        Обработчик post_save сравнивает оценку и произведение с
+        загруженными из БД и сдвигает счётчики на разницу, кто бы ни
+        сохранял отзыв: API, админка или код.
+        """
+        super().save(*args, **kwargs)
+        if not self.get_deferred_fields() & {'title_id', 'score'}:
+            self._loaded_score = (self.title_id, self.score)
+
 
 class Comment(models.Model):
     """Model Комментарий."""
@@ -149,6 +301,12 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['review', 'pub_date', 'id'],
+                         name='comment_review_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date', 'id'],
+                         name='comment_author_pub_date_idx'),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
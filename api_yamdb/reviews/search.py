@@ -0,0 +1,67 @@
+"""Полнотекстовый поиск по тексту отзывов.
+
+Индекс создаётся миграцией 0014 под конкретную СУБД:
+- SQLite — внешняя таблица FTS5 `reviews_review_fts` над
+  `reviews_review`, синхронизируемая триггерами;
+- PostgreSQL — GIN-индекс по выражению `to_tsvector(...)`, которое
+  совпадает с тем, что строит SearchVector, поэтому планировщик его
+  использует.
+"""
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Value
+
+FTS_TABLE = 'reviews_review_fts'
+SEARCH_CONFIG = 'russian'
+WORD_RE = re.compile(r'\w+')
+
+
+def fts_query(terms):
+    """Запрос FTS5 из слов пользователя: каждое слово в кавычках.
+
+    Так операторы и спецсимволы FTS5 во вводе не дают синтаксических
+    ошибок, а слова объединяются через AND.
+    """
+    return ' '.join(f'"{word}"' for word in WORD_RE.findall(terms))
+
+
+def search_reviews(queryset, terms):
+    """Отзывы, совпавшие с поисковым запросом, по убыванию релевантности.
+
+    Релевантность доступна в аннотации `search_rank`: больше — лучше.
+    """
+    if not WORD_RE.search(terms):
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        return search_sqlite(queryset, terms)
+    if vendor == 'postgresql':
+        return search_postgresql(queryset, terms)
+    return queryset.filter(text__icontains=terms).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+def search_sqlite(queryset, terms):
+    table = queryset.model._meta.db_table
+    # bm25() в FTS5 (столбец rank) отрицателен: чем меньше, тем лучше.
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[fts_query(terms)],
+        select={'search_rank': f'-{FTS_TABLE}.rank'},
+    ).order_by('-search_rank', '-pub_date', '-id')
+
+
+def search_postgresql(queryset, terms):
+    # psycopg2 нужен только на PostgreSQL.
+    from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                SearchVector)
+
+    vector = SearchVector('text', config=SEARCH_CONFIG)
+    query = SearchQuery(terms, config=SEARCH_CONFIG)
+    return queryset.annotate(
+        search_vector=vector,
+        search_rank=SearchRank(vector, query),
+    ).filter(search_vector=query).order_by('-search_rank', '-pub_date', '-id')
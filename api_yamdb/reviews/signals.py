@@ -0,0 +1,109 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import utils
+from .leaderboards import (category_scope, genre_scope,
+                           refresh_title_leaderboards)
+from .models import (Category, Comment, Genre, GenreTitle, LeaderboardEntry,
+                     Review, Title)
+
+# Отправляется после пересчёта сохранённого рейтинга в обход save().
+ratings_recomputed = Signal()
+
+_counters = threading.local()
+
+
+@contextmanager
+def counters_suspended():
+    """Отключает построчный пересчёт счётчиков в обработчиках ниже.
+
+    Для массовых операций: вызывающий код сам пересчитывает счётчики
+    затронутых произведений и отзывов один раз после записи.
+    """
+    previous = getattr(_counters, 'suspended', False)
+    _counters.suspended = True
+    try:
+        yield
+    finally:
+        _counters.suspended = previous
+
+
+def counters_active():
+    return not getattr(_counters, 'suspended', False)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_leaderboards(sender, instance, created=False, **kwargs):
+    if not created:
+        refresh_title_leaderboards(instance.pk)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_leaderboards(sender, instance, **kwargs):
+    refresh_title_leaderboards(instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_leaderboards(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        refresh_title_leaderboards(instance.pk)
+    else:
+        for title_id in pk_set or ():
+            refresh_title_leaderboards(title_id)
+
+
+@receiver(post_delete, sender=Category)
+def category_leaderboard(sender, instance, **kwargs):
+    LeaderboardEntry.objects.filter(scope=category_scope(instance.pk)).delete()
+
+
+@receiver(post_delete, sender=Genre)
+def genre_leaderboard(sender, instance, **kwargs):
+    LeaderboardEntry.objects.filter(scope=genre_scope(instance.pk)).delete()
+
+
+# Создание, изменение оценки и удаление отзывов и комментариев, в том
+# числе каскадное (вместе с автором, произведением или отзывом),
+# сдвигает счётчики в транзакции записи.
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or not counters_active():
+        return
+    if created:
+        utils.update_title_scores(instance.title_id, new_score=instance.score)
+        return
+    loaded = getattr(instance, '_loaded_score', None)
+    if loaded is None:
+        return
+    title_id, score = loaded
+    if title_id == instance.title_id:
+        utils.update_title_scores(title_id, score, instance.score)
+        return
+    utils.update_title_scores(title_id, old_score=score)
+    utils.update_title_scores(instance.title_id, new_score=instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if counters_active():
+        utils.update_title_scores(instance.title_id, old_score=instance.score)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and counters_active():
+        utils.update_review_comments(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if counters_active():
+        utils.update_review_comments(instance.review_id, -1)
@@ -0,0 +1,315 @@
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import (Case, Count, F, FloatField, Q, Sum, Value,
+                              When, Window)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, RowNumber
+
+from . import signals
+from .constants import MODERATION_CHUNK_SIZE, RATING_CHUNK_SIZE, SCORES
+from .leaderboards import refresh_title_leaderboards
+from .models import Comment, GenreTitle, Review, Title
+
+# Хранимые счётчики оценок произведения, сверяемые с таблицей отзывов.
+SCORE_COUNTERS = ('score_sum', 'review_count',
+                  *(Title.score_field(score) for score in SCORES))
+
+
+def rating_expression(score_delta, count_delta):
+    """Рейтинг после сдвига счётчиков, вычисляемый в том же UPDATE.
+
+    В UPDATE правые части видят значения строки до изменения, поэтому
+    новые сумма и число отзывов выражаются через старые и дельты.
+    """
+    return Case(
+        When(review_count=-count_delta, then=Value(None)),
+        default=(
+            Cast(F('score_sum') + score_delta, FloatField())
+            / (F('review_count') + count_delta)
+        ),
+        output_field=FloatField(),
+    )
+
+
+def update_title_scores(title_id, old_score=None, new_score=None):
+    """Переносит отзыв из оценки old_score в new_score.
+
+    None означает отсутствие отзыва: создание — (None, score),
+    удаление — (score, None). Сумма оценок, число отзывов, рейтинг и
+    гистограмма меняются одним атомарным UPDATE без чтения строки,
+    после чего обновляются рейтинги лучших. Вызывается в транзакции
+    записи отзыва.
+    """
+    if old_score == new_score:
+        return
+    score_delta = (new_score or 0) - (old_score or 0)
+    count_delta = 0
+    if old_score is None:
+        count_delta = 1
+    elif new_score is None:
+        count_delta = -1
+    changes = {
+        'score_sum': F('score_sum') + score_delta,
+        'review_count': F('review_count') + count_delta,
+        'rating': rating_expression(score_delta, count_delta),
+    }
+    if old_score is not None:
+        field = Title.score_field(old_score)
+        changes[field] = F(field) - 1
+    if new_score is not None:
+        field = Title.score_field(new_score)
+        changes[field] = F(field) + 1
+    Title.objects.filter(pk=title_id).update(**changes)
+    refresh_title_leaderboards(title_id)
+
+
+def title_score_stats(title_ids):
+    """Сумма оценок, число отзывов и гистограмма по таблице отзывов."""
+    histogram = {
+        Title.score_field(score): Count('id', filter=Q(score=score))
+        for score in SCORES
+    }
+    return {
+        row.pop('title_id'): row
+        for row in Review.objects.filter(title_id__in=title_ids)
+        .order_by().values('title_id')
+        .annotate(score_sum=Sum('score'), review_count=Count('id'),
+                  **histogram)
+    }
+
+
+def recompute_title_ratings(title_ids):
+    """Пересобирает рейтинг и гистограмму оценок для произведений."""
+    stats = title_score_stats(title_ids)
+    titles = list(Title.objects.filter(pk__in=title_ids).only('id'))
+    for title in titles:
+        row = stats.get(title.pk, {})
+        for field in SCORE_COUNTERS:
+            setattr(title, field, row.get(field) or 0)
+        title.rating = (
+            title.score_sum / title.review_count
+            if title.review_count else None
+        )
+    Title.objects.bulk_update(titles, (*SCORE_COUNTERS, 'rating'))
+    signals.ratings_recomputed.send(
+        sender=Title, title_ids=[title.pk for title in titles]
+    )
+    return len(titles)
+
+
+def update_review_comments(review_id, delta):
+    """Сдвигает счётчик комментариев отзыва одним UPDATE."""
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+def latest_comments(review_ids, limit):
+    """Последние limit комментариев каждого отзыва одним запросом.
+
+    Номер комментария в отзыве считает ROW_NUMBER() OVER (PARTITION BY
+    review_id) во вложенном запросе: Django 3.2 не фильтрует по оконным
+    аннотациям. Внешний запрос отбирает первые строки и присоединяет
+    авторов. Возвращает словарь {id отзыва: [комментарии]}.
+    """
+    ranked = Comment.objects.filter(review_id__in=review_ids).annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('review_id')],
+            order_by=[F('pub_date').desc(), F('id').desc()],
+        )
+    ).order_by().values('id', 'position')
+    sql, params = ranked.query.sql_with_params()
+    quote = connection.ops.quote_name
+    comments = Comment.objects.filter(pk__in=RawSQL(
+        f'SELECT {quote("id")} FROM ({sql}) {quote("ranked")} '
+        f'WHERE {quote("position")} <= %s',
+        (*params, limit)
+    )).select_related('author').order_by('review_id', '-pub_date', '-id')
+    result = defaultdict(list)
+    for comment in comments:
+        result[comment.review_id].append(comment)
+    return result
+
+
+def repair_review_counts(title_ids):
+    """Сверяет счётчики оценок произведений с таблицей отзывов.
+
+    Сравниваются число отзывов, сумма оценок и гистограмма;
+    произведения с расхождением пересчитываются целиком вместе с
+    рейтингом. Возвращает число исправленных.
+    """
+    stats = title_score_stats(title_ids)
+    drifted = [
+        row['pk'] for row in Title.objects.filter(pk__in=title_ids)
+        .values('pk', *SCORE_COUNTERS)
+        if any(
+            row[field] != (stats.get(row['pk'], {}).get(field) or 0)
+            for field in SCORE_COUNTERS
+        )
+    ]
+    if drifted:
+        recompute_title_ratings(drifted)
+    return len(drifted)
+
+
+def repair_comment_counts(review_ids):
+    """Сверяет счётчик комментариев отзывов, возвращает число исправленных."""
+    counts = dict(
+        Comment.objects.filter(review_id__in=review_ids).order_by()
+        .values('review_id').annotate(total=Count('id'))
+        .values_list('review_id', 'total')
+    )
+    drifted = []
+    for review in Review.objects.filter(pk__in=review_ids).only(
+            'id', 'comments_count'):
+        total = counts.get(review.pk, 0)
+        if review.comments_count != total:
+            review.comments_count = total
+            drifted.append(review)
+    Review.objects.bulk_update(drifted, ('comments_count',))
+    return len(drifted)
+
+
+def iter_pk_chunks(queryset, chunk_size=RATING_CHUNK_SIZE):
+    """Отдаёт первичные ключи queryset пачками по возрастанию."""
+    last_id = 0
+    while True:
+        chunk = list(
+            queryset.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def iter_title_id_chunks(chunk_size=RATING_CHUNK_SIZE):
+    """Отдаёт id произведений пачками по возрастанию первичного ключа."""
+    return iter_pk_chunks(Title.objects.all(), chunk_size)
+
+
+def bulk_create_titles(items):
+    """Создаёт произведения и связи с жанрами пакетными INSERT.
+
+    items — проверенные данные с объектами `category` и списком `genre`.
+    Если БД не возвращает ключи из пакетной вставки (SQLite), они
+    читаются сразу после неё: в транзакции после первой записи база
+    заблокирована для других писателей, поэтому последние строки — наши.
+    """
+    titles = [
+        Title(**{key: value for key, value in item.items() if key != 'genre'})
+        for item in items
+    ]
+    with transaction.atomic():
+        Title.objects.bulk_create(titles)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            pks = Title.objects.order_by('-pk').values_list(
+                'pk', flat=True)[:len(titles)]
+            for title, pk in zip(titles, sorted(pks)):
+                title.pk = pk
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre)
+            for title, item in zip(titles, items)
+            for genre in item['genre']
+        )
+    return titles
+
+
+def delete_in_chunks(queryset, chunk_size):
+    """Удаляет строки queryset пачками, возвращает число по моделям."""
+    deleted = defaultdict(int)
+    for chunk in iter_pk_chunks(queryset, chunk_size):
+        _, per_model = queryset.model.objects.filter(pk__in=chunk).delete()
+        for label, count in per_model.items():
+            deleted[label] += count
+    return deleted
+
+
+def recount_after_delete(title_ids, review_ids,
+                         chunk_size=MODERATION_CHUNK_SIZE):
+    """Пересчитывает рейтинг, счётчики и рейтинги лучших один раз.
+
+    Для удалений с отключённым построчным пересчётом: title_ids и
+    review_ids — уцелевшие произведения и отзывы, чьи отзывы или
+    комментарии удалены.
+    """
+    for start in range(0, len(title_ids), chunk_size):
+        recompute_title_ratings(title_ids[start:start + chunk_size])
+    for start in range(0, len(review_ids), chunk_size):
+        repair_comment_counts(review_ids[start:start + chunk_size])
+    for title_id in title_ids:
+        refresh_title_leaderboards(title_id)
+
+
+def moderate_delete(review_ids=(), comment_ids=(), author_id=None,
+                    chunk_size=MODERATION_CHUNK_SIZE):
+    """Массово удаляет отзывы и комментарии по id и/или автору.
+
+    Удаление идёт пачками в одной транзакции с отключённым построчным
+    пересчётом; рейтинг, счётчики и рейтинги лучших пересчитываются
+    один раз на каждое затронутое произведение и отзыв. Возвращает
+    сводку: сколько удалено отзывов, комментариев и сколько
+    произведений пересчитано.
+    """
+    reviews = Q(pk__in=review_ids)
+    comments = Q(pk__in=comment_ids)
+    if author_id is not None:
+        reviews |= Q(author_id=author_id)
+        comments |= Q(author_id=author_id)
+    reviews = Review.objects.filter(reviews)
+    comments = Comment.objects.filter(comments)
+    with transaction.atomic(), signals.counters_suspended():
+        title_ids = sorted(set(reviews.values_list('title_id', flat=True)))
+        review_ids = sorted(set(comments.values_list('review_id', flat=True)))
+        deleted = delete_in_chunks(comments, chunk_size)
+        for label, count in delete_in_chunks(reviews, chunk_size).items():
+            deleted[label] += count
+        recount_after_delete(title_ids, review_ids, chunk_size)
+    return {
+        'reviews': deleted[Review._meta.label],
+        'comments': deleted[Comment._meta.label],
+        'titles': len(title_ids),
+    }
+
+
+def delete_title(title):
+    """Удаляет произведение вместе с отзывами и комментариями.
+
+    Счётчики удаляемых вместе с ним отзывов не пересчитываются:
+    пересчитывать нечего.
+    """
+    with transaction.atomic(), signals.counters_suspended():
+        title.delete()
+
+
+def delete_review(review):
+    """Удаляет отзыв с комментариями, сдвигая оценки один раз.
+
+    Комментарии удаляются заранее без правки счётчика удаляемого
+    отзыва, затем сам отзыв — с обычными обработчиками.
+    """
+    with transaction.atomic():
+        with signals.counters_suspended():
+            Comment.objects.filter(review=review).delete()
+        review.delete()
+
+
+def delete_author(user, chunk_size=MODERATION_CHUNK_SIZE):
+    """Удаляет пользователя, пересчитывая счётчики один раз.
+
+    Каскад удаляет его отзывы (с комментариями к ним) и комментарии.
+    Пересчитываются только произведения его отзывов и чужие отзывы
+    с его комментариями.
+    """
+    reviews = Review.objects.filter(author=user)
+    comments = Comment.objects.filter(author=user).exclude(
+        review__author=user
+    )
+    with transaction.atomic(), signals.counters_suspended():
+        title_ids = sorted(set(reviews.values_list('title_id', flat=True)))
+        review_ids = sorted(set(comments.values_list('review_id', flat=True)))
+        user.delete()
+        recount_after_delete(title_ids, review_ids, chunk_size)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import ConfirmationCode, User
 
 
 @admin.register(User)
@@ -12,3 +12,9 @@ class UserAdmin(admin.ModelAdmin):
     list_editable = ('role',)
     search_fields = ('username', 'role',)
     empty_value_display = '-пусто-'
+
+
+@admin.register(ConfirmationCode)
+class ConfirmationCodeAdmin(admin.ModelAdmin):
+    list_display = ('user', 'expires_at')
+    readonly_fields = ('user', 'code_hash', 'expires_at')
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from .constants import PRINCIPAL_KEY, TOKEN_VERSION_CLAIM
+from .models import User
+
+
+def get_auth_cache():
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def principal_key(user_id, version):
+    return PRINCIPAL_KEY.format(user_id=user_id, version=version)
+
+
+def forget_principal(user):
+    """Убирает из кэша пользователя текущей и предыдущей версии токенов."""
+    get_auth_cache().delete_many([
+        principal_key(user.pk, version)
+        for version in {user.token_version, max(user.token_version - 1, 0)}
+    ])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без SELECT пользователя на каждый запрос.
+
+    Пользователь кэшируется на AUTH_CACHE_TIMEOUT по id и версии
+    токенов из claim `ver`. Смена роли или деактивация увеличивает
+    версию (User.save), и токены старой версии отклоняются. Кэш
+    очищается сигналами при сохранении пользователя. AUTH_CACHE_ALIAS
+    должен указывать на кэш, общий для всех процессов: иначе в кэше
+    другого процесса старая запись доживала бы до AUTH_CACHE_TIMEOUT.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя.')
+        version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+        cache = get_auth_cache()
+        key = principal_key(user_id, version)
+        user = cache.get(key)
+        if user is None:
+            user = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).first()
+            if user is None:
+                raise AuthenticationFailed(
+                    'Пользователь не найден.', code='user_not_found')
+            if user.token_version != version:
+                raise AuthenticationFailed(
+                    'Токен отозван, получите новый.', code='token_revoked')
+            cache.set(key, user, settings.AUTH_CACHE_TIMEOUT)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь деактивирован.', code='user_inactive')
+        return user
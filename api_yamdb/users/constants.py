@@ -2,4 +2,14 @@ MAX_LENGTH = 150
 EMAIL_LENGTH = 254
 CONF_CODE_LENGTH = 6
 CONF_EXPIRATION_HOURS = 1
+CONF_MAX_ATTEMPTS = 5
+CONF_HASH_LENGTH = 64
+CONF_HASH_SALT = 'users.confirmation_code'
+CONF_LOCKOUT_SECONDS = 60
+CONF_LOCKOUT_MAX_SECONDS = 60 * 60
+CONF_FAILURES_KEY = 'auth:code:failures:{user_id}'
+CONF_LOCKOUT_KEY = 'auth:code:lockout:{user_id}'
 USERNAME_REGEX = r'^[\w.@+-]+\Z'
+ACCESS_FIELDS = ('role', 'is_active', 'is_staff', 'is_superuser')
+TOKEN_VERSION_CLAIM = 'ver'
+PRINCIPAL_KEY = 'auth:user:{user_id}:{version}'
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from users.tasks import purge_expired_codes
+
+
+class Command(BaseCommand):
+    help = ('Удаляет истёкшие коды подтверждения. '
+            'С --enqueue ставит задачу в очередь фоновых задач.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Не удалять сразу, а поставить задачу в очередь.'
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            purge_expired_codes.delay()
+            self.stdout.write(self.style.SUCCESS(
+                'Задача очистки кодов поставлена в очередь.'))
+            return
+        deleted = purge_expired_codes()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено кодов подтверждения: {deleted}'))
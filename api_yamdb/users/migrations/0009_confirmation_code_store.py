@@ -0,0 +1,58 @@
+# Generated by Django 3.2 on 2026-10-18 17:54
+
+from datetime import timedelta
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+
+def move_codes(apps, schema_editor):
+    """Переносит выданные коды в новую таблицу хэшами на час."""
+    User = apps.get_model('users', 'User')
+    ConfirmationCode = apps.get_model('users', 'ConfirmationCode')
+    expires_at = timezone.now() + timedelta(hours=1)
+    ConfirmationCode.objects.bulk_create(
+        (
+            ConfirmationCode(
+                user_id=pk,
+                code_hash=salted_hmac(
+                    'users.confirmation_code', code, algorithm='sha256'
+                ).hexdigest(),
+                expires_at=expires_at,
+            )
+            for pk, code in User.objects.exclude(confirmation_code=None)
+            .exclude(confirmation_code='')
+            .values_list('pk', 'confirmation_code').iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfirmationCode',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='confirmation', serialize=False, to='users.user', verbose_name='Пользователь')),
+                ('code_hash', models.CharField(max_length=64, verbose_name='Хэш кода')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Действует до')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+            ],
+            options={
+                'verbose_name': 'Код подтверждения',
+                'verbose_name_plural': 'Коды подтверждения',
+            },
+        ),
+        migrations.RunPython(move_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='confirmation_code',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 17:57
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_confirmation_code_store'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='confirmationcode',
+            name='attempts',
+        ),
+    ]
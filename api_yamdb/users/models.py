@@ -1,11 +1,7 @@
-import random
-import string
-
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from django.utils import timezone
 
-from .constants import (CONF_CODE_LENGTH, CONF_EXPIRATION_HOURS, EMAIL_LENGTH,
+from .constants import (ACCESS_FIELDS, CONF_HASH_LENGTH, EMAIL_LENGTH,
                         MAX_LENGTH)
 from .validators import validate_username, validate_username_format
 
@@ -33,11 +29,42 @@ class User(AbstractUser):
     last_name = models.CharField('Фамилия',
                                  max_length=MAX_LENGTH,
                                  blank=True)
-    confirmation_code = models.SlugField(null=True, blank=True, unique=True)
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ['id']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        if not user.get_deferred_fields() & set(ACCESS_FIELDS):
+            user._loaded_access = user.access_state()
+        return user
+
+    def access_state(self):
+        return tuple(getattr(self, field) for field in ACCESS_FIELDS)
+
+    def save(self, *args, **kwargs):
+        """Сохранение с отзывом токенов при смене прав доступа.
+
+        Если с момента загрузки изменились роль, активность или флаги
+        администратора, версия токенов растёт, и выданные ранее токены
+        перестают приниматься.
+        """
+        loaded = getattr(self, '_loaded_access', None)
+        if loaded is not None and loaded != self.access_state():
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        if loaded is not None or not self.get_deferred_fields():
+            self._loaded_access = self.access_state()
+
     @property
     def is_user(self):
         return self.role == self.USER
@@ -50,12 +77,30 @@ class User(AbstractUser):
     def is_moderator(self):
         return self.role == self.MODERATOR
 
-    def generate_confirmation_code(self):
-        code = ''.join(random.choices(
-            string.ascii_letters + string.digits, k=CONF_CODE_LENGTH))
-        self.confirmation_code = code
-        self.confirmation_code_expiration = (
-            timezone.now() + timezone.timedelta(hours=CONF_EXPIRATION_HOURS)
-        )
-        self.save()
-        return code
+
+class ConfirmationCode(models.Model):
+    """Хэш действующего кода подтверждения пользователя.
+
+    Коды живут отдельно от таблицы пользователей: выдача кода
+    переписывает короткую строку без уникального индекса по коду.
+    Строка удаляется при успешном входе, истёкшие строки вычищает
+    фоновая задача. Неверные попытки считаются в кэше
+    (users.throttling), чтобы перебор не писал в БД.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='confirmation',
+        verbose_name='Пользователь'
+    )
+    code_hash = models.CharField('Хэш кода', max_length=CONF_HASH_LENGTH)
+    expires_at = models.DateTimeField('Действует до', db_index=True)
+
+    class Meta:
+        verbose_name = 'Код подтверждения'
+        verbose_name_plural = 'Коды подтверждения'
+
+    def __str__(self):
+        return f'{self.user_id} до {self.expires_at:%Y-%m-%d %H:%M}'
@@ -1,7 +1,8 @@
+from django.db.models import Q
 from rest_framework import serializers
 from users.models import User
 from .constants import EMAIL_LENGTH, MAX_LENGTH
-from .utils import send_confirmation_code
+from .utils import register_user, send_confirmation_code
 from .validators import validate_username, validate_username_format
 
 
@@ -52,38 +53,42 @@ class SignUpSerializer(serializers.ModelSerializer):
         fields = ('email', 'username')
 
     def validate(self, data):
+        """Одна выборка по username или email.
+
+        Пользователь с той же парой получает новый код, совпадение
+        только по одному из полей — ошибка. Найденная строка
+        сохраняется для create, чтобы не искать её повторно.
+        """
         email = data.get('email')
         username = data.get('username')
-
-        user = User.objects.filter(email=email, username=username).first()
-
-        if user:
-            # Если пользователь уже существует, вернем его данные
-            # (например, отправим новый код подтверждения)
-            user.generate_confirmation_code()
-            user.save()
+        matches = list(
+            User.objects.filter(Q(username=username) | Q(email=email))
+            .only('id', 'username', 'email')
+        )
+        self.existing_user = next((
+            user for user in matches
+            if user.username == username and user.email == email
+        ), None)
+        if self.existing_user:
             return data
 
-        if User.objects.filter(email=email).exists():
+        if any(user.email == email for user in matches):
             raise serializers.ValidationError(
                 {'email': 'Пользователь с таким email уже существует.'}
             )
 
-        if User.objects.filter(username=username).exists():
+        if matches:
             raise serializers.ValidationError(
                 {'username': 'Пользователь с таким username уже существует.'}
             )
         return data
 
     def create(self, validated_data):
-        user, created = User.objects.get_or_create(
-            username=validated_data['username'],
-            email=validated_data['email']
+        user, code = register_user(
+            validated_data['username'], validated_data['email'],
+            self.existing_user
         )
-        # Генерация и отправка кода подтверждения
-        user.generate_confirmation_code()
-        send_confirmation_code(user)
-        user.save()
+        send_confirmation_code(user, code)
         return user
 
 
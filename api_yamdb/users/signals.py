@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import forget_principal
+from .constants import ACCESS_FIELDS
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Запись только служебных полей (код подтверждения) не меняет
+    # права пользователя, и кэш аутентификации остаётся верным.
+    if update_fields is not None and not (
+            set(update_fields) & {*ACCESS_FIELDS, 'token_version'}):
+        return
+    forget_principal(instance)
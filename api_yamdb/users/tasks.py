@@ -0,0 +1,9 @@
+from jobs.queue import task
+
+from .utils import purge_confirmation_codes
+
+
+@task
+def purge_expired_codes():
+    """Вычищает истёкшие коды подтверждения."""
+    return purge_confirmation_codes()
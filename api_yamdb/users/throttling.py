@@ -0,0 +1,95 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from .constants import (CONF_FAILURES_KEY, CONF_LOCKOUT_KEY,
+                        CONF_LOCKOUT_MAX_SECONDS, CONF_LOCKOUT_SECONDS,
+                        CONF_MAX_ATTEMPTS)
+
+
+def get_throttle_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def code_lockout(user_id):
+    """Сколько секунд ещё заблокирован ввод кода, или None."""
+    until = get_throttle_cache().get(
+        CONF_LOCKOUT_KEY.format(user_id=user_id)
+    )
+    if until is None:
+        return None
+    wait = until - time.time()
+    return wait if wait > 0 else None
+
+
+def record_code_failure(user_id):
+    """Считает неверный код в кэше, без записи в БД.
+
+    После CONF_MAX_ATTEMPTS ошибок ввод кода блокируется, и каждая
+    следующая ошибка удваивает блокировку до CONF_LOCKOUT_MAX_SECONDS.
+    Счётчик живёт столько же, сколько самая долгая блокировка.
+    Он сдвигается через add + incr, чтобы параллельные ошибки не
+    затирали друг друга; в Memcached это атомарно, FileBasedCache
+    выполняет incr как чтение и запись и может потерять ошибку при
+    одновременных запросах.
+    """
+    cache = get_throttle_cache()
+    key = CONF_FAILURES_KEY.format(user_id=user_id)
+    cache.add(key, 0, CONF_LOCKOUT_MAX_SECONDS)
+    try:
+        failures = cache.incr(key)
+    except ValueError:
+        # Ключ истёк между add и incr.
+        failures = 1
+        cache.set(key, failures, CONF_LOCKOUT_MAX_SECONDS)
+    # incr базового бэкенда перезаписывает ключ с таймаутом по умолчанию.
+    cache.touch(key, CONF_LOCKOUT_MAX_SECONDS)
+    excess = failures - CONF_MAX_ATTEMPTS
+    if excess < 0:
+        return
+    duration = min(
+        CONF_LOCKOUT_SECONDS * 2 ** excess, CONF_LOCKOUT_MAX_SECONDS
+    )
+    cache.set(
+        CONF_LOCKOUT_KEY.format(user_id=user_id),
+        time.time() + duration, duration
+    )
+
+
+def reset_code_failures(user_id):
+    get_throttle_cache().delete_many([
+        CONF_FAILURES_KEY.format(user_id=user_id),
+        CONF_LOCKOUT_KEY.format(user_id=user_id),
+    ])
+
+
+class SharedCacheRateThrottle(SimpleRateThrottle):
+    """Ограничение частоты по IP в общем для worker'ов кэше.
+
+    Ключ — IP клиента и для аутентифицированных запросов: токен не
+    должен снимать ограничение с эндпоинтов входа. Частота читается
+    из настроек при каждом запросе, а не при импорте.
+    """
+
+    @property
+    def cache(self):
+        return get_throttle_cache()
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)
+        }
+
+
+class TokenRateThrottle(SharedCacheRateThrottle):
+    scope = 'auth_token'
+
+
+class SignUpRateThrottle(SharedCacheRateThrottle):
+    scope = 'auth_signup'
@@ -1,23 +1,132 @@
-import random
 import string
+from datetime import timedelta
 
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import (constant_time_compare, get_random_string,
+                                 salted_hmac)
+from rest_framework import serializers
+from rest_framework_simplejwt.tokens import AccessToken
 
-from api_yamdb.settings import DEFAULT_FROM_EMAIL
+from mailer.outbox import queue_mail
 
-from .constants import CONF_CODE_LENGTH
+from .constants import (CONF_CODE_LENGTH, CONF_EXPIRATION_HOURS,
+                        CONF_HASH_SALT, TOKEN_VERSION_CLAIM)
+from .models import ConfirmationCode, User
+from .throttling import record_code_failure, reset_code_failures
 
 
-def send_confirmation_code(user):
-    confirmation_code = ''.join(random.choices(
-        string.ascii_letters + string.digits, k=CONF_CODE_LENGTH))
-    user.confirmation_code = confirmation_code
-    user.save()
+def make_confirmation_code():
+    """Код из криптографически стойкого генератора (secrets)."""
+    return get_random_string(
+        CONF_CODE_LENGTH, string.ascii_letters + string.digits)
 
-    send_mail(
+
+def hash_confirmation_code(code):
+    """HMAC кода на SECRET_KEY: в БД не хранится сам код."""
+    return salted_hmac(
+        CONF_HASH_SALT, str(code), algorithm='sha256'
+    ).hexdigest()
+
+
+def issue_confirmation_code(user, created=False):
+    """Выдаёт новый код пользователю и возвращает его.
+
+    Строка кода переписывается одним UPDATE; для нового пользователя
+    (created) или при первой выдаче — одним INSERT. Прежний код
+    перестаёт действовать; счётчик ошибок в кэше не сбрасывается,
+    чтобы новый код не снимал блокировку перебора.
+    """
+    code = make_confirmation_code()
+    values = {
+        'code_hash': hash_confirmation_code(code),
+        'expires_at': (
+            timezone.now() + timedelta(hours=CONF_EXPIRATION_HOURS)
+        ),
+    }
+    codes = ConfirmationCode.objects.filter(user_id=user.pk)
+    if not created and codes.update(**values):
+        return code
+    try:
+        with transaction.atomic():
+            ConfirmationCode.objects.create(user_id=user.pk, **values)
+    except IntegrityError:
+        # Код этому пользователю параллельно выдал другой запрос.
+        codes.update(**values)
+    return code
+
+
+def check_confirmation_code(user, code):
+    """Проверяет и гасит код пользователя.
+
+    Неверный или истёкший код не пишет в БД: ошибка считается в кэше
+    (record_code_failure). Верный код удаляется условным DELETE по
+    хэшу, поэтому войти по нему можно один раз.
+    """
+    code_hash = ConfirmationCode.objects.filter(
+        user_id=user.pk, expires_at__gt=timezone.now()
+    ).values_list('code_hash', flat=True).first()
+    if code_hash is None or not constant_time_compare(
+            code_hash, hash_confirmation_code(code)):
+        record_code_failure(user.pk)
+        return False
+    used, _ = ConfirmationCode.objects.filter(
+        user_id=user.pk, code_hash=code_hash
+    ).delete()
+    if used:
+        reset_code_failures(user.pk)
+    return bool(used)
+
+
+def purge_confirmation_codes():
+    """Удаляет истёкшие коды, возвращает их число."""
+    deleted, _ = ConfirmationCode.objects.filter(
+        expires_at__lte=timezone.now()
+    ).delete()
+    return deleted
+
+
+def register_user(username, email, user=None):
+    """Регистрирует пользователя и выдаёт ему код подтверждения.
+
+    user — строка, найденная при валидации: ей только выдаётся новый
+    код, таблица пользователей не пишется. Новый пользователь
+    создаётся одним INSERT. Если того же пользователя параллельно
+    создал другой запрос, INSERT упадёт на уникальности username, и код
+    выдаётся уже созданной строке. Возвращает (пользователь, код).
+    """
+    created = False
+    if user is None:
+        user = User(username=username, email=email)
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+            created = True
+        except IntegrityError:
+            user = User.objects.filter(
+                username=username, email=email
+            ).only('id', 'username', 'email').first()
+            if user is None:
+                raise serializers.ValidationError(
+                    {'username': 'Пользователь с таким username '
+                                 'уже существует.'}
+                )
+    return user, issue_confirmation_code(user, created=created)
+
+
+def send_confirmation_code(user, code):
+    """Кладёт письмо с кодом подтверждения в исходящую очередь."""
+    queue_mail(
         'Your confirmation code',
-        f'Your confirmation code is {confirmation_code}',
-        DEFAULT_FROM_EMAIL,
+        f'Your confirmation code is {code}',
         [user.email],
-        fail_silently=False,
     )
+
+
+def get_token_for_user(user):
+    """Access-токен с ролью, именем и версией токенов пользователя."""
+    token = AccessToken.for_user(user)
+    token['username'] = user.username
+    token['role'] = user.role
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return str(token)
@@ -1,52 +1,96 @@
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import Throttled
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
+from api.mixin import EagerLoadingMixin
+from api.pagination import FeedPagination
+from api.serializers import UserCommentSerializer, UserReviewSerializer
+from reviews.models import Comment, Review
+from reviews.utils import delete_author
 from .models import User
 from .permissions import IsAdmin
 from .serializers import (AdminUserSerializer, SignUpSerializer,
                           TokenSerializer, UserSerializer)
+from .throttling import SignUpRateThrottle, TokenRateThrottle, code_lockout
+from .utils import check_confirmation_code, get_token_for_user
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     permission_classes = (IsAdmin,)
     http_method_names = ['get', 'post', 'patch', 'delete']
     lookup_field = 'username'
     filter_backends = (SearchFilter,)
     search_fields = ('username',)
+    activity_serializers = {
+        'reviews': UserReviewSerializer,
+        'comments': UserCommentSerializer,
+    }
 
     def get_serializer_class(self):
+        if self.action in self.activity_serializers:
+            return self.activity_serializers[self.action]
         if self.request.user.is_staff:
             return AdminUserSerializer
         return UserSerializer
 
+    def activity_feed(self, queryset):
+        """Лента записей автора по индексу (author, pub_date, id).
+
+        Названия произведений подтягиваются JOIN в запросе страницы.
+        """
+        author = get_object_or_404(
+            User.objects.only('id'), username=self.kwargs['username']
+        )
+        page = self.paginate_queryset(
+            self.eager_load(queryset.filter(author=author))
+        )
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, permission_classes=(AllowAny,),
+            pagination_class=FeedPagination)
+    def reviews(self, request, username=None):
+        return self.activity_feed(Review.objects.all())
+
+    @action(detail=True, permission_classes=(AllowAny,),
+            pagination_class=FeedPagination)
+    def comments(self, request, username=None):
+        return self.activity_feed(Comment.objects.all())
+
+    def perform_destroy(self, instance):
+        delete_author(instance)
+
     def get_object(self):
         if self.action == 'me':
-            return self.request.user
+            # request.user может быть копией из кэша аутентификации,
+            # профиль читается и сохраняется по свежей строке.
+            return get_object_or_404(User, pk=self.request.user.pk)
         return super().get_object()
 
     @action(detail=False, methods=['get', 'patch'],
             permission_classes=(IsAuthenticated,))
     def me(self, request):
+        user = self.get_object()
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         elif request.method == 'PATCH':
-            serializer = self.get_serializer(request.user,
+            serializer = self.get_serializer(user,
                                              data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role, partial=True)
+            serializer.save(role=user.role, partial=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class SignUpViewSet(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [SignUpRateThrottle]
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
@@ -63,6 +107,7 @@ class SignUpViewSet(APIView):
 
 class TokenViewSet(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [TokenRateThrottle]
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
@@ -72,9 +117,11 @@ class TokenViewSet(APIView):
 
             user = get_object_or_404(User, username=username)
 
-            if user.confirmation_code != confirmation_code:
-                # Перегенерируем код
-                user.generate_confirmation_code()
+            wait = code_lockout(user.pk)
+            if wait is not None:
+                raise Throttled(wait)
+
+            if not check_confirmation_code(user, confirmation_code):
                 return Response(
                     {'error': 'Invalid or expired'
                      'confirmation code. Please try again.'},
@@ -82,7 +129,7 @@ class TokenViewSet(APIView):
                 )
 
             # token = str(RefreshToken.for_user(user))
-            token = str(AccessToken.for_user(user))
+            token = get_token_for_user(user)
             return Response({'token': token}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,11 @@
+import pytest
+
+from tests.utils import clear_caches
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    # Между тестами БД очищается без сигналов, поэтому версии в кэше
+    # не сдвигаются и кэш нужно сбрасывать явно.
+    yield
+    clear_caches()
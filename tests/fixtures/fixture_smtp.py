@@ -0,0 +1,79 @@
+import socketserver
+import threading
+
+import pytest
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-диалог: принимает письма и запоминает их.
+
+    Адресаты, содержащие `reject`, отклоняются кодом 550.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        recipients = []
+        self.reply('220 localhost ready')
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'RCPT':
+                if 'reject' in command:
+                    self.reply('550 mailbox unavailable')
+                    continue
+                recipients.append(command.split(':', 1)[1].strip('<> '))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 end with .')
+                body = []
+                for data_line in self.rfile:
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    body.append(data_line.decode())
+                with server.lock:
+                    server.messages.append((recipients, ''.join(body)))
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RSET':
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+
+
+@pytest.fixture
+def smtp_server(settings):
+    """Локальный SMTP-сервер вместо настоящего почтового."""
+    server = SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST = '127.0.0.1'
+    settings.EMAIL_PORT = server.server_address[1]
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = ''
+    settings.EMAIL_HOST_PASSWORD = ''
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_tasks(settings):
+    """Фоновые задачи в тестах выполняются сразу, как без очереди."""
+    settings.TASKS_ALWAYS_EAGER = True
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08StoredRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    HISTOGRAM_URL_TEMPLATE = '/api/v1/titles/{title_id}/score-histogram/'
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_writes(self, admin_client, admin,
+                                             user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что сохранённый рейтинг произведения обновляется '
+            'при создании отзыва.'
+        )
+
+        create_single_review(user_client, title_id, 'text', 10)
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения равен средней оценке '
+            'после добавления второго отзыва.'
+        )
+
+        response = admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 1}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_recompute_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            score_sum=0, review_count=0, rating=None, score_5=0
+        )
+
+        call_command('recompute_ratings', chunk_size=1)
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count, title.rating,
+                title.score_histogram[5]) == (5, 1, 5.0, 1), (
+            'Проверьте, что команда `recompute_ratings` восстанавливает '
+            'сохранённый рейтинг произведения.'
+        )
+
+    def test_03_score_histogram(self, client, admin_client, admin,
+                                user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 9)
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 9}
+        )
+        expected = {str(score): 0 for score in range(1, 11)}
+        expected['9'] = 2
+
+        url = self.HISTOGRAM_URL_TEMPLATE.format(title_id=title_id)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{url}` доступен без авторизации.'
+        )
+        assert response.json() == {
+            'id': title_id, 'review_count': 2, 'score_histogram': expected
+        }, (
+            f'Проверьте, что эндпоинт `{url}` возвращает распределение '
+            'оценок с учётом изменения отзывов.'
+        )
+
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        assert 'score_histogram' not in client.get(detail_url).json()
+        response = client.get(detail_url, {'include': 'score_histogram'})
+        assert response.json()['score_histogram'] == expected, (
+            f'Проверьте, что `{detail_url}?include=score_histogram` '
+            'встраивает гистограмму оценок в ответ.'
+        )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleKeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'title {index // 2:02}', year=2000)
+            for index in range(25)
+        )
+        return list(Title.objects.order_by('name', 'id')
+                    .values_list('id', flat=True))
+
+    def collect(self, client, url, link):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что ссылка `{link}` в ответе на GET-запрос к '
+                f'`{self.TITLES_URL}` ведёт на существующую страницу.'
+            )
+            data = response.json()
+            page = [title['id'] for title in data['results']]
+            ids = page + ids if link == 'previous' else ids + page
+            url = data[link]
+        return ids, data
+
+    def test_01_cursor_walks_all_titles(self, client, titles):
+        forward, last_page = self.collect(client, self.TITLES_URL, 'next')
+        assert forward == titles, (
+            f'Проверьте, что переход по ссылкам `next` эндпоинта '
+            f'`{self.TITLES_URL}` возвращает все произведения в порядке '
+            '(name, id) без пропусков и повторов.'
+        )
+        assert last_page['count'] == len(titles)
+
+        backward, _ = self.collect(client, last_page['previous'], 'previous')
+        assert backward == titles[:-len(last_page['results'])], (
+            f'Проверьте, что переход по ссылкам `previous` эндпоинта '
+            f'`{self.TITLES_URL}` возвращает предыдущие страницы.'
+        )
+
+    def test_02_page_compatibility(self, client, titles):
+        response = client.get(self.TITLES_URL, {'page': 2})
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()['results']] == (
+            titles[10:20]
+        ), (
+            f'Проверьте, что параметр `page` эндпоинта `{self.TITLES_URL}` '
+            'по-прежнему работает для первых страниц.'
+        )
+
+        response = client.get(self.TITLES_URL, {'page': 1000})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_invalid_cursor(self, client, titles):
+        response = client.get(self.TITLES_URL, {'cursor': 'garbage'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с '
+            'некорректным курсором возвращает ответ со статусом 404.'
+        )
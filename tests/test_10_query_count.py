@@ -0,0 +1,85 @@
+import pytest
+
+from tests.utils import (check_query_count, create_comments, create_reviews,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def authors(self, django_user_model):
+        def create(count):
+            return [
+                django_user_model.objects.create(
+                    username=f'author{index}',
+                    email=f'author{index}@yamdb.fake'
+                )
+                for index in range(count)
+            ]
+        return create
+
+    def test_01_titles(self, client, admin_client):
+        from reviews.models import Category, Genre, Title
+
+        create_titles(admin_client)
+
+        def populate():
+            category = Category.objects.first()
+            genres = list(Genre.objects.all())
+            for index in range(8):
+                title = Title.objects.create(
+                    name=f'title {index}', year=2000, category=category
+                )
+                title.genre.set(genres)
+
+        check_query_count(client, self.TITLES_URL, populate)
+        title = Title.objects.get(name='Крепкий орешек')
+        check_query_count(
+            client, f'{self.TITLES_URL}{title.pk}/',
+            lambda: title.genre.set(Genre.objects.all())
+        )
+
+    def test_02_reviews(self, client, admin_client, admin, authors):
+        from reviews.models import Review
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+
+        def populate():
+            Review.objects.bulk_create(
+                Review(title_id=title_id, author=author, text='text', score=5)
+                for author in authors(8)
+            )
+
+        check_query_count(
+            client, self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            populate
+        )
+
+    def test_03_comments(self, client, admin_client, admin, authors):
+        from reviews.models import Comment
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        review_id = reviews[0]['id']
+
+        def populate():
+            Comment.objects.bulk_create(
+                Comment(review_id=review_id, author=author, text='text')
+                for author in authors(8)
+            )
+
+        check_query_count(
+            client, self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=review_id
+            ),
+            populate
+        )
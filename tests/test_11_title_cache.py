@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get(self, client, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), len(queries)
+
+    def test_01_repeated_reads_are_cached(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url, params in ((self.TITLES_URL, {'genre': 'horror'}),
+                            (detail_url, None)):
+            first, _ = self.get(client, url, params)
+            second, queries = self.get(client, url, params)
+            assert second == first and queries == 0, (
+                f'Проверьте, что повторный GET-запрос к `{url}` отдаётся '
+                'из кэша без запросов к БД.'
+            )
+
+    def test_02_writes_invalidate(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        other_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        self.get(client, self.TITLES_URL)
+        self.get(client, detail_url)
+        self.get(client, other_url)
+
+        create_single_review(user_client, title_id, 'text', 8)
+        data, _ = self.get(client, detail_url)
+        assert data['rating'] == 8, (
+            'Проверьте, что кэш карточки произведения сбрасывается после '
+            'добавления отзыва.'
+        )
+        data, _ = self.get(client, self.TITLES_URL)
+        assert {title['id']: title['rating']
+                for title in data['results']}[title_id] == 8, (
+            f'Проверьте, что кэш списка `{self.TITLES_URL}` сбрасывается '
+            'после добавления отзыва.'
+        )
+        _, queries = self.get(client, other_url)
+        assert queries == 0, (
+            'Проверьте, что отзыв не сбрасывает кэш других произведений.'
+        )
+
+        admin_client.delete('/api/v1/categories/films/')
+        data, _ = self.get(client, detail_url)
+        assert data['category'] is None, (
+            'Проверьте, что кэш карточки произведения сбрасывается после '
+            'удаления категории.'
+        )
+
+    def test_03_versions_shared_between_processes(self, client,
+                                                  admin_client):
+        from django.conf import settings
+        from django.core.cache import caches
+        from django.core.cache.backends.filebased import FileBasedCache
+
+        from api.cache import CATALOG_VERSION_KEY, get_cache
+
+        titles, _, _ = create_titles(admin_client)
+        self.get(client, self.TITLES_URL)
+        # Отдельный экземпляр кэша с тем же хранилищем — как в другом
+        # процессе: локальная память процессов у них не общая.
+        alias = settings.TITLES_CACHE_ALIAS
+        other = FileBasedCache(
+            caches[alias]._dir, settings.CACHES[alias].get('OPTIONS', {})
+        )
+        before = other.get(CATALOG_VERSION_KEY)
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Другое'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        after = other.get(CATALOG_VERSION_KEY)
+        assert before is not None and after != before, (
+            'Проверьте, что версии кэша произведений хранятся в общем '
+            'для процессов кэше и запись сдвигает их для всех.'
+        )
+        assert after == get_cache().get(CATALOG_VERSION_KEY)
+
+    def test_04_concurrent_bumps_get_distinct_versions(self):
+        from api.cache import CATALOG_VERSION_KEY, bump_version, get_cache
+
+        seen = set()
+        for _ in range(20):
+            bump_version(CATALOG_VERSION_KEY)
+            seen.add(get_cache().get(CATALOG_VERSION_KEY))
+        assert len(seen) == 20, (
+            'Проверьте, что каждый сдвиг версии кэша произведений даёт '
+            'новое значение, а не инкремент, который одновременные '
+            'писатели могут свести к одной версии.'
+        )
@@ -0,0 +1,73 @@
+from itertools import combinations
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from tests.utils import check_no_full_scan
+
+FILTER_VALUES = {
+    'genre': 'genre-7',
+    'category': 'category-3',
+    'name': 'title 00042',
+    'year': 1990,
+}
+
+
+@pytest.fixture(scope='module')
+def seeded_titles(django_db_setup, django_db_blocker):
+    from reviews.models import Category, Genre, GenreTitle, Title
+
+    with django_db_blocker.unblock():
+        Category.objects.bulk_create(
+            Category(name=f'category {index}', slug=f'category-{index}')
+            for index in range(10)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'genre {index}', slug=f'genre-{index}')
+            for index in range(20)
+        )
+        categories = list(Category.objects.values_list('id', flat=True))
+        genres = list(Genre.objects.values_list('id', flat=True))
+        Title.objects.bulk_create(
+            Title(
+                name=f'title {index:05}',
+                year=1950 + index % 70,
+                category_id=categories[index % len(categories)],
+            )
+            for index in range(5000)
+        )
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title_id, genre_id=genres[index % 20])
+            for index, title_id in enumerate(
+                Title.objects.values_list('id', flat=True)
+            )
+        )
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        yield
+        # Очистка без сигналов: обработчики удаления здесь не нужны.
+        call_command('flush', interactive=False, verbosity=0)
+
+
+@pytest.mark.django_db
+class Test12TitleIndexes:
+
+    @pytest.mark.parametrize('fields', [
+        fields
+        for size in range(len(FILTER_VALUES) + 1)
+        for fields in combinations(FILTER_VALUES, size)
+    ])
+    def test_01_title_filters_use_indexes(self, seeded_titles, fields):
+        from api.filters import TitleFilter
+        from api.views import TitleViewSet
+
+        params = {field: FILTER_VALUES[field] for field in fields}
+        queryset = TitleFilter(
+            params, queryset=TitleViewSet.queryset.all()
+        ).qs
+        check_no_full_scan(
+            queryset[:10], f'к `/api/v1/titles/` с фильтрами {params}',
+            allow_index_scan=not params
+        )
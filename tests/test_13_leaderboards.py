@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Leaderboards:
+
+    TOP_URL = '/api/v1/titles/top/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    @pytest.fixture(autouse=True)
+    def small_leaderboards(self, monkeypatch):
+        monkeypatch.setattr('reviews.leaderboards.LEADERBOARD_SIZE', 2)
+        monkeypatch.setattr('reviews.leaderboards.LEADERBOARD_MIN_REVIEWS', 1)
+
+    def top(self, client, **params):
+        response = client.get(self.TOP_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.TOP_URL}` доступен без '
+            'авторизации.'
+        )
+        return [(title['name'], title['rating']) for title in response.json()]
+
+    def test_01_top_is_maintained(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+            'category': 'films'
+        })
+        titles.append(response.json())
+        assert self.top(client) == []
+
+        reviews = [
+            create_single_review(user_client, title['id'], 'text', score)
+            .json()
+            for title, score in zip(titles, (6, 8, 7))
+        ]
+        assert self.top(client) == [('Крепкий орешек', 8), ('Чужой', 7)], (
+            f'Проверьте, что `{self.TOP_URL}` возвращает лучшие '
+            'произведения по убыванию рейтинга.'
+        )
+        assert self.top(client, genre='horror') == [
+            ('Чужой', 7), ('Терминатор', 6)
+        ]
+        assert self.top(client, category='books') == [('Крепкий орешек', 8)]
+
+        admin_client.delete(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[1]['id']
+        ))
+        assert self.top(client) == [('Чужой', 7), ('Терминатор', 6)], (
+            'Проверьте, что после удаления отзыва рейтинг лучших '
+            'дополняется следующим произведением.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            data={'score': 10}
+        )
+        assert self.top(client) == [('Терминатор', 10), ('Чужой', 7)], (
+            'Проверьте, что рейтинг лучших обновляется при изменении оценки.'
+        )
+
+    def test_02_top_validation(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(self.TOP_URL, {'genre': 'unknown'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(
+            self.TOP_URL, {'genre': 'horror', 'category': 'films'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_demoted_title_leaves_full_top(self, client, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+            'category': 'films'
+        })
+        titles.append(response.json())
+        reviews = [
+            create_single_review(user_client, title['id'], 'text', score)
+            .json()
+            for title, score in zip(titles, (9, 8, 7))
+        ]
+        assert self.top(client) == [('Терминатор', 9), ('Крепкий орешек', 8)]
+
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        user_client.patch(url, data={'score': 1})
+        assert self.top(client) == [('Крепкий орешек', 8), ('Чужой', 7)], (
+            'Проверьте, что произведение, оценка которого опустилась ниже '
+            'произведения вне заполненного рейтинга, уступает ему место.'
+        )
+
+        user_client.patch(url, data={'score': 10})
+        assert self.top(client) == [('Терминатор', 10), ('Крепкий орешек', 8)]
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleBulkCreate:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_not_admin(self, client, user_client):
+        for response in (
+            client.post(self.BULK_URL, data='[]',
+                        content_type='application/json'),
+            user_client.post(self.BULK_URL, data=[], format='json'),
+        ):
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что POST-запрос к `{self.BULK_URL}` доступен '
+                'только администратору.'
+            )
+
+    def test_02_bulk_create(self, admin_client):
+        from reviews.models import GenreTitle, Title
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = [
+            {'name': f'Фильм {index}', 'year': 2000 + index % 20,
+             'genre': ['horror', 'drama'], 'category': 'films'}
+            for index in range(50)
+        ]
+        items[3]['genre'] = ['unknown']
+        items[7]['category'] = 'unknown'
+        items[9]['year'] = 3000
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(
+                self.BULK_URL, data=items, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'создаёт корректные произведения и возвращает статус 201.'
+        )
+        data = response.json()
+        assert [error['index'] for error in data['errors']] == [3, 7, 9], (
+            f'Проверьте, что `{self.BULK_URL}` возвращает ошибки '
+            'некорректных элементов по их индексам.'
+        )
+        assert len(data['created']) == 47
+        assert Title.objects.count() == 47
+        assert GenreTitle.objects.count() == 94
+        assert data['created'][0]['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Ужасы', 'slug': 'horror'},
+        ]
+        assert len(queries) < 20, (
+            f'Проверьте, что `{self.BULK_URL}` не выполняет запросы к БД '
+            'для каждого элемента.'
+        )
+
+    def test_03_bulk_all_invalid(self, admin_client):
+        response = admin_client.post(
+            self.BULK_URL, data=[{'name': 'x'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.BULK_URL, data={'name': 'x'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
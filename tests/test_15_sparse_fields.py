@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), ' '.join(
+            query['sql'] for query in queries.captured_queries
+        )
+
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        data, sql = self.get(client, self.TITLES_URL, {'fields': 'id,name'})
+        assert all(set(title) == {'id', 'name'}
+                   for title in data['results']), (
+            f'Проверьте, что `{self.TITLES_URL}?fields=id,name` возвращает '
+            'только перечисленные поля.'
+        )
+        for column in ('description', 'reviews_genre', 'reviews_category'):
+            assert column not in sql, (
+                f'Проверьте, что `{self.TITLES_URL}?fields=id,name` не '
+                f'загружает из БД `{column}`.'
+            )
+
+        data, sql = self.get(
+            client, self.TITLES_URL, {'exclude': 'description,genre'}
+        )
+        assert all(set(title) == {'id', 'name', 'year', 'rating',
+                                  'reviews_count', 'category'}
+                   for title in data['results'])
+        assert 'description' not in sql and 'reviews_genre' not in sql
+
+    def test_02_reviews_and_comments_fields(self, client, admin_client,
+                                            admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        data, sql = self.get(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            {'fields': 'id,score'}
+        )
+        assert data['results'] == [{'id': reviews[0]['id'], 'score': 5}]
+        assert 'users_user' not in sql
+
+        data, sql = self.get(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            {'exclude': 'author'}
+        )
+        assert 'author' not in data['results'][0]
+        assert 'users_user' not in sql
+
+    def test_03_fields_ignored_on_write(self, user_client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+            + '?fields=id',
+            data={'text': 'text', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['text'] == 'text'
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ListCounts:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def get(self, client, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        counts = [query['sql'] for query in queries.captured_queries
+                  if 'COUNT(' in query['sql']]
+        return response.json(), counts
+
+    def test_01_count_opt_out(self, client, admin_client, admin, user_client,
+                              user, moderator_client, moderator):
+        _, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client,
+        })
+        urls = (
+            self.TITLES_URL,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+        )
+        for url in urls:
+            data, counts = self.get(client, url, {'count': 'none'})
+            assert data['count'] is None and not counts, (
+                f'Проверьте, что `{url}?count=none` не выполняет COUNT(*) '
+                'и возвращает `count: null`.'
+            )
+            assert data['results'], url
+
+    def test_02_reviews_count_from_counter(self, client, admin_client, admin,
+                                           user_client, user):
+        _, _, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        data, counts = self.get(
+            client, self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert data['count'] == 2 and not counts, (
+            'Проверьте, что число отзывов берётся из счётчика произведения.'
+        )
+
+    def test_03_comments_count_from_counter(self, client, admin_client,
+                                            admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        data, counts = self.get(client, url)
+        assert data['count'] == 1 and not counts, (
+            'Проверьте, что число комментариев берётся из счётчика отзыва.'
+        )
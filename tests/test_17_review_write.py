@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ReviewWritePath:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    # Пользователь, произведение, INSERT, UPDATE счётчиков и два чтения
+    # рейтингов лучших; управление транзакцией не в счёт.
+    CREATE_QUERY_BUDGET = 6
+
+    def post(self, client, title_id):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+                data={'text': 'text', 'score': 7}
+            )
+        statements = [
+            query['sql'] for query in queries.captured_queries
+            if not query['sql'].startswith(('BEGIN', 'SAVEPOINT', 'RELEASE'))
+        ]
+        return response, statements
+
+    def test_01_create_query_budget(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        response, statements = self.post(user_client, titles[0]['id'])
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(statements) <= self.CREATE_QUERY_BUDGET, (
+            'Проверьте, что создание отзыва выполняет не больше '
+            f'{self.CREATE_QUERY_BUDGET} запросов к БД:\n'
+            + '\n'.join(statements)
+        )
+        assert not any('SELECT (1)' in sql for sql in statements), (
+            'Проверьте, что дубликат отзыва отсекается ограничением БД, '
+            'а не отдельным запросом.'
+        )
+
+    def test_02_duplicate_is_rejected_by_constraint(self, admin_client,
+                                                    user_client):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        self.post(user_client, titles[0]['id'])
+        response, _ = self.post(user_client, titles[0]['id'])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставили отзыв на это произведение.'
+        ]}
+        assert Review.objects.count() == 1
+        assert Title.objects.get(pk=titles[0]['id']).review_count == 1, (
+            'Проверьте, что отклонённый дубликат не меняет счётчики '
+            'произведения.'
+        )
+
+    def test_03_other_integrity_errors_are_not_duplicates(
+            self, admin_client, user_client, monkeypatch):
+        from django.db import IntegrityError
+
+        from reviews import utils
+        from reviews.models import Review
+
+        def broken_leaderboards(title_id):
+            raise IntegrityError('leaderboard')
+
+        titles, _, _ = create_titles(admin_client)
+        monkeypatch.setattr(
+            utils, 'refresh_title_leaderboards', broken_leaderboards
+        )
+        with pytest.raises(IntegrityError):
+            self.post(user_client, titles[0]['id'])
+        assert not Review.objects.exists(), (
+            'Проверьте, что ошибка целостности вне ограничения '
+            'unique_review не выдаётся за повторный отзыв.'
+        )
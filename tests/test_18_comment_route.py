@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18CommentRoute:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_mismatched_title_and_review(self, client, admin_client,
+                                            admin, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'с отзывом другого произведения возвращает ответ со статусом 404.'
+        )
+        assert client.get(
+            f'{url}{comments[0]["id"]}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        response = user_client.post(url, data={'text': 'text'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что POST-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'с отзывом другого произведения возвращает ответ со статусом 404.'
+        )
+
+    def test_02_single_review_lookup(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'count': 'none'})
+        assert response.status_code == HTTPStatus.OK
+        review_lookups = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "reviews_review"')
+        ]
+        assert len(review_lookups) == 1 and len(queries) == 2, (
+            f'Проверьте, что GET-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'загружает отзыв один раз, а комментарии с авторами — одним '
+            'запросом.'
+        )
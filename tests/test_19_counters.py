@@ -0,0 +1,224 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Counters:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
+    )
+
+    def get_counters(self, client, title_id, review_id):
+        title = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+        review = client.get(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )).json()
+        return title['reviews_count'], review['comments_count']
+
+    def test_01_counters_follow_writes(self, client, admin_client, admin,
+                                       user_client, user):
+        comments, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        assert self.get_counters(client, title_id, review_id) == (2, 2), (
+            'Проверьте, что произведение возвращает `reviews_count`, а '
+            'отзыв — `comments_count`, и они растут при создании.'
+        )
+
+        response = admin_client.delete(self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id,
+            comment_id=comments[0]['id']
+        ))
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = admin_client.delete(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[1]['id']
+        ))
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_counters(client, title_id, review_id) == (1, 1), (
+            'Проверьте, что счётчики уменьшаются при удалении отзыва и '
+            'комментария.'
+        )
+
+    def test_02_counters_follow_cascades(self, client, admin_client, admin,
+                                         user_client, user):
+        _, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        title_id = titles[0]['id']
+        user.delete()
+
+        assert self.get_counters(client, title_id, reviews[0]['id']) == (
+            1, 1
+        ), (
+            'Проверьте, что каскадное удаление отзывов и комментариев '
+            'вместе с автором обновляет счётчики.'
+        )
+        title = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+        assert title['rating'] == 5, (
+            'Проверьте, что каскадное удаление отзывов пересчитывает '
+            'рейтинг произведения.'
+        )
+
+    def test_03_check_counters_command(self, client, admin_client, admin,
+                                       user_client):
+        from reviews.models import Review, Title
+
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        create_single_review(user_client, title_id, 'text', 9)
+        Title.objects.filter(pk=title_id).update(review_count=7)
+        Review.objects.filter(pk=review_id).update(comments_count=0)
+
+        call_command('check_counters', chunk_size=1)
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.review_count, title.score_sum, title.rating) == (
+            2, 14, 7.0
+        ), (
+            'Проверьте, что команда `check_counters` исправляет счётчик '
+            'отзывов произведения.'
+        )
+        assert Review.objects.get(pk=review_id).comments_count == 1, (
+            'Проверьте, что команда `check_counters` исправляет счётчик '
+            'комментариев отзыва.'
+        )
+
+    def populate(self, django_user_model, reviews_count):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Каскад', year=2000)
+        authors = [
+            django_user_model.objects.create(
+                username=f'author{index}', email=f'a{index}@yamdb.fake'
+            )
+            for index in range(reviews_count)
+        ]
+        for index, author in enumerate(authors):
+            review = Review.objects.create(
+                title=title, author=author, text='text',
+                score=index % 10 + 1
+            )
+            for _ in range(3):
+                Comment.objects.create(
+                    review=review, author=authors[0], text='text'
+                )
+        return title, authors
+
+    def delete_queries(self, client, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        return len(context.captured_queries)
+
+    def test_04_cascade_delete_query_count(self, admin_client,
+                                           django_user_model):
+        from reviews.models import Title
+
+        counts = []
+        for size in (3, 15):
+            title, _ = self.populate(django_user_model, size)
+            counts.append(self.delete_queries(
+                admin_client,
+                self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.pk)
+            ))
+            django_user_model.objects.filter(
+                username__startswith='author').delete()
+        # Без построчного пересчёта число запросов не растёт с числом
+        # отзывов и комментариев (разница в 12 отзывов и 36 комментариев).
+        assert abs(counts[1] - counts[0]) <= 2, (
+            'Проверьте, что удаление произведения не пересчитывает '
+            'счётчики для каждого удаляемого каскадом отзыва и '
+            f'комментария: запросов {counts}.'
+        )
+        assert not Title.objects.exists()
+
+    def test_05_user_delete_recounts_once(self, admin_client,
+                                          django_user_model):
+        from reviews.models import Review, Title
+
+        title, authors = self.populate(django_user_model, 4)
+        other = Title.objects.create(name='Другое', year=2000)
+        Review.objects.create(
+            title=other, author=authors[1], text='text', score=3
+        )
+        self.delete_queries(
+            admin_client, f'/api/v1/users/{authors[0].username}/'
+        )
+        title.refresh_from_db()
+        other.refresh_from_db()
+        assert (title.review_count, title.score_sum, title.score_1) == (
+            3, 2 + 3 + 4, 0
+        ), (
+            'Проверьте, что удаление пользователя пересчитывает рейтинг '
+            'произведений его отзывов.'
+        )
+        assert (other.review_count, other.score_sum) == (1, 3)
+        assert set(Review.objects.filter(title=title).values_list(
+            'comments_count', flat=True
+        )) == {0}, (
+            'Проверьте, что удаление пользователя пересчитывает счётчики '
+            'комментариев чужих отзывов.'
+        )
+
+    def test_06_score_change_outside_api(self, django_user_model):
+        from reviews.models import Review, Title
+
+        title, authors = self.populate(django_user_model, 1)
+        other = Title.objects.create(name='Другое', year=2000)
+        review = Review.objects.get()
+        review.score = 10
+        review.save()
+        title.refresh_from_db()
+        assert (title.rating, title.score_1, title.score_10) == (
+            10.0, 0, 1
+        ), (
+            'Проверьте, что изменение оценки через `Review.save()` '
+            '(например, в админке) пересчитывает рейтинг и гистограмму.'
+        )
+
+        review = Review.objects.get()
+        review.title = other
+        review.save()
+        title.refresh_from_db()
+        other.refresh_from_db()
+        assert (title.review_count, title.score_10) == (0, 0)
+        assert (other.review_count, other.score_10, other.rating) == (
+            1, 1, 10.0
+        ), (
+            'Проверьте, что перенос отзыва в другое произведение '
+            'переносит его оценку.'
+        )
+
+    def test_07_check_counters_compares_scores(self, django_user_model):
+        from reviews.models import Title
+
+        title, _ = self.populate(django_user_model, 2)
+        Title.objects.filter(pk=title.pk).update(
+            score_sum=10, rating=5.0, score_1=0, score_5=2
+        )
+        call_command('check_counters')
+        title.refresh_from_db()
+        assert (title.score_sum, title.rating, title.score_1,
+                title.score_5) == (3, 1.5, 1, 0), (
+            'Проверьте, что команда `check_counters` сверяет сумму оценок '
+            'и гистограмму, а не только число отзывов.'
+        )
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from tests.utils import check_no_full_scan
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20FeedPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def feed(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='title', year=2000)
+        authors = [
+            django_user_model.objects.create(
+                username=f'author{index}', email=f'author{index}@yamdb.fake'
+            )
+            for index in range(25)
+        ]
+        reviews = [
+            Review.objects.create(title=title, author=author, text='text',
+                                  score=5)
+            for author in authors
+        ]
+        review = reviews[0]
+        comments = [
+            Comment.objects.create(review=review, author=author, text='text')
+            for author in authors
+        ]
+        # Часть записей с одинаковой датой: порядок решает id.
+        now = timezone.now()
+        for model, objects in ((Review, reviews), (Comment, comments)):
+            for index, obj in enumerate(objects):
+                model.objects.filter(pk=obj.pk).update(
+                    pub_date=now - timedelta(minutes=index // 3)
+                )
+        return {
+            'title': title,
+            'review': review,
+            'reviews': list(Review.objects.filter(title=title)
+                            .order_by('-pub_date', '-id')
+                            .values_list('id', flat=True)),
+            'comments': list(Comment.objects.filter(review=review)
+                             .order_by('-pub_date', '-id')
+                             .values_list('id', flat=True)),
+        }
+
+    def collect(self, client, url, link):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что ссылка `{link}` в ответе ведёт на '
+                'существующую страницу.'
+            )
+            data = response.json()
+            page = [obj['id'] for obj in data['results']]
+            ids = page + ids if link == 'previous' else ids + page
+            url = data[link]
+        return ids, data
+
+    def test_01_cursor_walks_feeds(self, client, feed):
+        urls = {
+            'reviews': self.REVIEWS_URL_TEMPLATE.format(
+                title_id=feed['title'].pk
+            ),
+            'comments': self.COMMENTS_URL_TEMPLATE.format(
+                title_id=feed['title'].pk, review_id=feed['review'].pk
+            ),
+        }
+        for name, url in urls.items():
+            forward, last_page = self.collect(client, url, 'next')
+            assert forward == feed[name], (
+                f'Проверьте, что переход по ссылкам `next` эндпоинта `{url}` '
+                'возвращает все записи от новых к старым без пропусков и '
+                'повторов.'
+            )
+            assert last_page['count'] == len(feed[name])
+            backward, _ = self.collect(
+                client, last_page['previous'], 'previous'
+            )
+            assert backward == feed[name][:-len(last_page['results'])], (
+                f'Проверьте, что переход по ссылкам `previous` эндпоинта '
+                f'`{url}` возвращает предыдущие страницы.'
+            )
+            response = client.get(url, {'cursor': 'garbage'})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `{url}` с некорректным '
+                'курсором возвращает ответ со статусом 404.'
+            )
+
+    def test_02_cursor_uses_index(self, feed):
+        from api.pagination import FeedPagination
+        from reviews.models import Comment, Review
+
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        paginator = FeedPagination()
+        querysets = {
+            'отзывов': Review.objects.filter(title=feed['title']),
+            'комментариев': Comment.objects.filter(review=feed['review']),
+        }
+        for name, queryset in querysets.items():
+            last = queryset.order_by('-pub_date', '-id')[10]
+            key = {'pub_date': last.pub_date, 'id': last.pk}
+            page = queryset.order_by(*paginator.ordering).filter(
+                paginator.keyset_filter(key, reverse=False)
+            )[:paginator.page_size + 1]
+            check_no_full_scan(page, f'страницы {name} по курсору')
+            assert 'TEMP B-TREE' not in page.explain(), (
+                f'Проверьте, что страница {name} по курсору читается в '
+                'порядке индекса без сортировки.'
+            )
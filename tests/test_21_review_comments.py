@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21EmbeddedComments:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def reviews(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='title', year=2000)
+        authors = [
+            django_user_model.objects.create(
+                username=f'author{index}', email=f'author{index}@yamdb.fake'
+            )
+            for index in range(4)
+        ]
+        expected = {}
+        for author in authors[:3]:
+            review = Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+            comments = [
+                Comment.objects.create(review=review, author=commenter,
+                                       text=f'comment {index}')
+                for index, commenter in enumerate(authors)
+            ]
+            expected[review.pk] = [
+                comment.pk for comment in sorted(
+                    comments, key=lambda comment: (comment.pub_date,
+                                                   comment.pk),
+                    reverse=True
+                )
+            ]
+        return title, expected
+
+    def get(self, client, title, params):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        return url, response, queries
+
+    def test_01_latest_comments_embedded(self, client, reviews):
+        title, expected = reviews
+        url, response, queries = self.get(
+            client, title, {'include': 'comments', 'comments_limit': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert {
+            review['id']: [comment['id'] for comment in review['comments']]
+            for review in results
+        } == {pk: ids[:2] for pk, ids in expected.items()}, (
+            f'Проверьте, что `{url}?include=comments&comments_limit=2` '
+            'встраивает в каждый отзыв два последних комментария.'
+        )
+        assert set(results[0]['comments'][0]) == {
+            'id', 'text', 'author', 'pub_date'
+        }
+        comment_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'reviews_comment' in query['sql']
+        ]
+        assert len(comment_queries) == 1, (
+            f'Проверьте, что комментарии для `{url}?include=comments` '
+            'загружаются одним запросом на всю страницу отзывов.'
+        )
+        assert 'ROW_NUMBER' in comment_queries[0].upper()
+        assert 'users_user' in comment_queries[0], (
+            'Проверьте, что авторы комментариев загружаются тем же запросом.'
+        )
+
+    def test_02_comments_are_optional(self, client, reviews):
+        title, _ = reviews
+        url, response, queries = self.get(client, title, {})
+        assert 'comments' not in response.json()['results'][0], (
+            f'Проверьте, что `{url}` без `include=comments` не встраивает '
+            'комментарии.'
+        )
+        assert not any('reviews_comment' in query['sql']
+                       for query in queries.captured_queries)
+
+        for limit in ('0', '100', 'many'):
+            _, response, _ = self.get(
+                client, title, {'include': 'comments', 'comments_limit': limit}
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{url}` с некорректным `comments_limit` '
+                'возвращает ответ со статусом 400.'
+            )
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import check_no_full_scan
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ReviewSearch:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def reviews(self, django_user_model):
+        from reviews.models import Review, Title
+
+        title, other = (Title.objects.create(name=name, year=2000)
+                        for name in ('title', 'other'))
+        texts = (
+            'Отличный фильм, отличный сюжет и отличная музыка.',
+            'Скучный сюжет, но отличный актёр.',
+            'Ничего особенного.',
+        )
+        reviews = {}
+        for index, text in enumerate(texts):
+            author = django_user_model.objects.create(
+                username=f'author{index}', email=f'author{index}@yamdb.fake'
+            )
+            reviews[text] = Review.objects.create(
+                title=title, author=author, text=text, score=5
+            )
+            Review.objects.create(title=other, author=author, text=text,
+                                  score=5)
+        return title, reviews, texts
+
+    def search(self, client, title, terms):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)
+        response = client.get(url, {'search': terms})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}?search=` возвращает ответ '
+            'со статусом 200.'
+        )
+        return url, response.json()
+
+    def test_01_search_is_ranked(self, client, reviews):
+        title, objects, texts = reviews
+        url, data = self.search(client, title, 'ОТЛИЧНЫЙ')
+        assert [review['id'] for review in data['results']] == [
+            objects[texts[0]].pk, objects[texts[1]].pk
+        ], (
+            f'Проверьте, что `{url}?search=` находит отзывы произведения по '
+            'словам текста без учёта регистра, более релевантные — первыми.'
+        )
+        assert data['count'] == 2
+
+        _, data = self.search(client, title, 'скучный сюжет')
+        assert [review['id'] for review in data['results']] == [
+            objects[texts[1]].pk
+        ], (
+            f'Проверьте, что `{url}?search=` требует совпадения всех слов.'
+        )
+        for terms in ('"AND OR(', 'отсутствует'):
+            _, data = self.search(client, title, terms)
+            assert data['results'] == [], (
+                f'Проверьте, что `{url}?search=` не падает на спецсимволах '
+                'и не находит лишнего.'
+            )
+
+    def test_02_index_follows_writes(self, client, admin_client, reviews):
+        title, objects, texts = reviews
+        review = objects[texts[2]]
+        review.text = 'Теперь отличный'
+        review.save()
+        objects[texts[0]].delete()
+
+        _, data = self.search(client, title, 'отличный')
+        assert {review['id'] for review in data['results']} == {
+            objects[texts[1]].pk, review.pk
+        }, (
+            'Проверьте, что поисковый индекс обновляется при изменении и '
+            'удалении отзывов.'
+        )
+
+    def test_03_search_uses_index(self, reviews):
+        from reviews.models import Review
+        from reviews.search import search_reviews
+
+        title, _, _ = reviews
+        check_no_full_scan(
+            search_reviews(Review.objects.filter(title=title), 'отличный'),
+            'поиска по отзывам',
+        )
+
+    def test_04_search_ignored_on_detail(self, client, admin_client,
+                                         reviews):
+        title, found, texts = reviews
+        review = found[texts[0]]
+        url = (
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title.pk)}'
+            f'{review.pk}/?search=несовпадение'
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что параметр `search` не влияет на получение '
+            'отдельного отзыва.'
+        )
+        response = admin_client.patch(url, data={'text': 'Новый текст.'})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что параметр `search` не влияет на изменение отзыва.'
+        )
+        response = admin_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что параметр `search` не влияет на удаление отзыва.'
+        )
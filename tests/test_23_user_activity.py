@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (check_no_full_scan, check_query_count,
+                         create_comments)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23UserActivity:
+
+    USER_REVIEWS_URL_TEMPLATE = '/api/v1/users/{username}/reviews/'
+    USER_COMMENTS_URL_TEMPLATE = '/api/v1/users/{username}/comments/'
+
+    def test_01_user_feeds(self, client, admin_client, admin, user_client,
+                           user):
+        comments, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        url = self.USER_REVIEWS_URL_TEMPLATE.format(username=user.username)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{url}` доступен без авторизации.'
+        )
+        assert response.json()['results'] == [{
+            'id': reviews[1]['id'],
+            'title': {'id': titles[0]['id'], 'name': titles[0]['name']},
+            'text': reviews[1]['text'],
+            'score': reviews[1]['score'],
+            'pub_date': response.json()['results'][0]['pub_date'],
+            'comments_count': 0,
+        }], (
+            f'Проверьте, что `{url}` возвращает отзывы пользователя с '
+            'названием произведения.'
+        )
+
+        url = self.USER_COMMENTS_URL_TEMPLATE.format(username=user.username)
+        results = client.get(url).json()['results']
+        assert [(comment['id'], comment['review'], comment['title']['id'])
+                for comment in results] == [
+            (comments[1]['id'], reviews[0]['id'], titles[0]['id'])
+        ], (
+            f'Проверьте, что `{url}` возвращает комментарии пользователя с '
+            'отзывом и произведением.'
+        )
+
+        url = self.USER_REVIEWS_URL_TEMPLATE.format(username='nobody')
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_constant_queries(self, client, admin_client, admin,
+                                 django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        _, reviews, _ = create_comments(admin_client, {admin: admin_client})
+
+        def populate_reviews():
+            for index in range(5):
+                title = Title.objects.create(name=f'title {index}', year=2000)
+                Review.objects.create(title=title, author=admin, text='text',
+                                      score=5)
+
+        def populate_comments():
+            for review in Review.objects.all():
+                Comment.objects.create(review=review, author=admin,
+                                       text='text')
+
+        queries = check_query_count(
+            client,
+            self.USER_REVIEWS_URL_TEMPLATE.format(username=admin.username),
+            populate_reviews
+        )
+        check_query_count(
+            client,
+            self.USER_COMMENTS_URL_TEMPLATE.format(username=admin.username),
+            populate_comments
+        )
+        assert queries <= 3, (
+            'Проверьте, что лента пользователя загружается запросом '
+            'пользователя, страницы и подсчёта.'
+        )
+
+    def test_03_feeds_use_author_index(self, admin):
+        from api.pagination import FeedPagination
+        from reviews.models import Comment, Review
+
+        ordering = FeedPagination.ordering
+        for model in (Review, Comment):
+            queryset = model.objects.filter(author=admin).order_by(*ordering)
+            check_no_full_scan(queryset[:10], f'ленты {model.__name__}')
+            assert 'TEMP B-TREE' not in queryset[:10].explain(), (
+                'Проверьте, что лента автора читается в порядке индекса '
+                '(author, pub_date, id).'
+            )
@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BulkModeration:
+
+    URL = '/api/v1/moderation/bulk-delete/'
+
+    @pytest.fixture
+    def spam(self, django_user_model, user):
+        from reviews.models import Comment, Review, Title
+
+        spammer = django_user_model.objects.create(
+            username='spammer', email='spammer@yamdb.fake'
+        )
+        titles = [Title.objects.create(name=f'title {index}', year=2000)
+                  for index in range(3)]
+        kept = Review.objects.create(title=titles[0], author=user,
+                                     text='text', score=8)
+        spam_reviews = [
+            Review.objects.create(title=title, author=spammer, text='spam',
+                                  score=1)
+            for title in titles
+        ]
+        Comment.objects.create(review=kept, author=spammer, text='spam')
+        Comment.objects.create(review=kept, author=user, text='text')
+        Comment.objects.create(review=spam_reviews[1], author=user,
+                               text='text')
+        return spammer, titles, kept, spam_reviews
+
+    def test_01_permissions(self, client, user_client, moderator_client):
+        response = client.post(self.URL, data={'author': 'nobody'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(self.URL, data={'author': 'nobody'})
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.URL}` недоступен обычному пользователю.'
+        )
+        response = moderator_client.post(self.URL, data={},
+                                         format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.URL}` без reviews, comments и author '
+            'возвращает ответ со статусом 400.'
+        )
+
+    def test_02_delete_by_author(self, moderator_client, spam):
+        from reviews.models import Comment, Review, Title
+
+        spammer, titles, kept, spam_reviews = spam
+        with CaptureQueriesContext(connection) as queries:
+            response = moderator_client.post(
+                self.URL, data={'author': spammer.username}, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'reviews': 3, 'comments': 2, 'titles': 3}, (
+            f'Проверьте, что `{self.URL}` возвращает сводку удалённого с '
+            'учётом каскадно удалённых комментариев.'
+        )
+        assert not Review.objects.filter(author=spammer).exists()
+        title = Title.objects.get(pk=titles[0].pk)
+        assert (title.review_count, title.rating) == (1, 8.0), (
+            'Проверьте, что рейтинг и счётчик отзывов пересчитываются после '
+            'массового удаления.'
+        )
+        assert Title.objects.get(pk=titles[2].pk).review_count == 0
+        assert Review.objects.get(pk=kept.pk).comments_count == 1
+        assert Comment.objects.count() == 1
+
+        updates = [query['sql'] for query in queries.captured_queries
+                   if query['sql'].startswith('UPDATE "reviews_title"')]
+        assert len(updates) == 1, (
+            'Проверьте, что произведения пересчитываются одним запросом, а '
+            'не после удаления каждого отзыва.'
+        )
+
+    def test_03_delete_by_ids(self, moderator_client, spam):
+        from reviews.models import Comment, Review, Title
+
+        _, titles, kept, spam_reviews = spam
+        comment = Comment.objects.get(review=kept, text='spam')
+        response = moderator_client.post(self.URL, data={
+            'reviews': [spam_reviews[0].pk], 'comments': [comment.pk]
+        }, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'reviews': 1, 'comments': 1, 'titles': 1}
+        assert Review.objects.count() == 3
+        assert Review.objects.get(pk=kept.pk).comments_count == 1
+        title = Title.objects.get(pk=titles[0].pk)
+        assert (title.review_count, title.score_sum) == (1, 8)
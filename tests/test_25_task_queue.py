@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from jobs.queue import claim_jobs, run_job, task
+
+calls = []
+
+
+@task(name='tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='tests.flaky', max_attempts=2)
+def flaky(value):
+    calls.append(value)
+    raise ValueError(value)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TaskQueue:
+
+    @pytest.fixture(autouse=True)
+    def queued(self, settings):
+        settings.TASKS_ALWAYS_EAGER = False
+        calls.clear()
+
+    def run_worker(self, threads=1):
+        from jobs.worker import Worker
+
+        worker = Worker(threads=threads, poll_interval=0.01,
+                        visibility_timeout=60, name='test')
+        worker.run(burst=True)
+        return worker
+
+    def test_01_signup_email_is_deferred(self, client):
+        from jobs.models import Job
+
+        outbox_before = len(mail.outbox)
+        response = client.post('/api/v1/auth/signup/', data={
+            'email': 'valid@yamdb.fake', 'username': 'valid-username'
+        })
+        assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before, (
+            'Проверьте, что письмо с кодом подтверждения отправляется '
+            'фоновой задачей, а не в запросе регистрации.'
+        )
+        assert Job.objects.filter(status=Job.PENDING).count() == 1
+
+        worker = self.run_worker()
+        assert (worker.processed, worker.failed) == (1, 0)
+        assert len(mail.outbox) == outbox_before + 1, (
+            'Проверьте, что worker отправляет письмо из очереди.'
+        )
+        assert Job.objects.get().status == Job.DONE
+
+    def test_02_thread_pool_runs_all_jobs(self):
+        from jobs.models import Job
+
+        for value in range(6):
+            record.delay(value)
+        worker = self.run_worker(threads=3)
+        assert sorted(calls) == list(range(6)), (
+            'Проверьте, что worker с пулом потоков выполняет каждую задачу '
+            'ровно один раз.'
+        )
+        assert worker.processed == 6
+        assert set(Job.objects.values_list('status', flat=True)) == {
+            Job.DONE
+        }
+
+    def test_03_retry_with_backoff(self):
+        from jobs.models import Job
+
+        job = flaky.delay('boom')
+        self.run_worker()
+        job.refresh_from_db()
+        assert (job.status, job.attempts) == (Job.PENDING, 1), (
+            'Проверьте, что упавшая задача возвращается в очередь.'
+        )
+        assert job.run_at > timezone.now(), (
+            'Проверьте, что повтор откладывается на время backoff.'
+        )
+        assert 'ValueError' in job.last_error
+
+        self.run_worker()
+        assert calls == ['boom'], (
+            'Проверьте, что задача не запускается до окончания backoff.'
+        )
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        self.run_worker()
+        job.refresh_from_db()
+        assert (job.status, job.attempts) == (Job.FAILED, 2), (
+            'Проверьте, что после max_attempts попыток задача помечается '
+            'как failed.'
+        )
+
+    def test_04_visibility_timeout(self):
+        from jobs.models import Job
+
+        job = record.delay('once')
+        [stale] = claim_jobs('dead-worker', 1, visibility_timeout=60)
+        assert claim_jobs('other', 1, visibility_timeout=60) == [], (
+            'Проверьте, что арендованную задачу не забирает другой worker.'
+        )
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        [fresh] = claim_jobs('other', 1, visibility_timeout=60)
+        assert (fresh.pk, fresh.attempts) == (job.pk, 2), (
+            'Проверьте, что задачу с истёкшей арендой забирает другой worker.'
+        )
+        assert run_job(fresh)
+        run_job(stale)
+        job.refresh_from_db()
+        assert (job.status, job.locked_by) == (Job.DONE, 'other')
+        assert calls == ['once', 'once']
+
+    def test_05_finished_jobs_are_purged(self, settings):
+        from jobs.models import Job
+        from jobs.queue import purge_finished
+
+        done, failed, recent = (record.delay(value) for value in 'abc')
+        pending = record.delay('d')
+        Job.objects.filter(pk=pending.pk).update(
+            run_at=timezone.now() + timedelta(hours=1)
+        )
+        self.run_worker()
+        Job.objects.filter(pk=failed.pk).update(status=Job.FAILED)
+        Job.objects.filter(pk__in=[done.pk, failed.pk]).update(
+            finished_at=timezone.now() - timedelta(
+                seconds=settings.TASKS_RETENTION + 1)
+        )
+        assert purge_finished() == 2
+        assert set(Job.objects.values_list('pk', flat=True)) == {
+            recent.pk, pending.pk
+        }, (
+            'Проверьте, что `purge_finished` удаляет только давно '
+            'завершённые задачи.'
+        )
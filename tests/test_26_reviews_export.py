@@ -0,0 +1,86 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ReviewsExport:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/export.ndjson'
+
+    @pytest.fixture
+    def title(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='title', year=2000)
+        authors = [
+            django_user_model.objects.create(
+                username=f'author{index}', email=f'author{index}@yamdb.fake'
+            )
+            for index in range(5)
+        ]
+        for index, author in enumerate(authors):
+            review = Review.objects.create(title=title, author=author,
+                                           text=f'review {index}', score=5)
+            for commenter in authors[:index]:
+                Comment.objects.create(review=review, author=commenter,
+                                       text='text')
+        return title
+
+    def export(self, client, title):
+        url = self.EXPORT_URL_TEMPLATE.format(title_id=title.pk)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что эндпоинт `{url}` доступен без авторизации.'
+            )
+            assert response.streaming, (
+                f'Проверьте, что `{url}` отдаёт ответ потоком.'
+            )
+            body = b''.join(response.streaming_content).decode('utf-8')
+        return url, response, body, queries
+
+    def test_01_export_lines(self, client, title):
+        url, response, body, _ = self.export(client, title)
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in body.splitlines()]
+        assert [line['text'] for line in lines] == [
+            f'review {index}' for index in range(5)
+        ], (
+            f'Проверьте, что `{url}` выгружает по строке JSON на каждый '
+            'отзыв в порядке публикации.'
+        )
+        assert [len(line['comments']) for line in lines] == [0, 1, 2, 3, 4]
+        assert lines[4]['author'] == 'author4'
+        assert lines[4]['comments'][0]['author'] == 'author0', (
+            f'Проверьте, что `{url}` выгружает авторов отзывов и '
+            'комментариев.'
+        )
+
+    def test_02_export_is_chunked(self, client, title, monkeypatch):
+        import api.views
+
+        monkeypatch.setattr(api.views, 'EXPORT_CHUNK_SIZE', 2)
+        url, _, body, queries = self.export(client, title)
+        assert len(body.splitlines()) == 5
+        comment_queries = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "reviews_comment"')
+        ]
+        assert len(comment_queries) == 3, (
+            f'Проверьте, что `{url}` загружает комментарии одним запросом '
+            'на пачку отзывов.'
+        )
+        assert all('users_user' in sql for sql in comment_queries)
+        assert len(queries) == 5, (
+            f'Проверьте, что `{url}` читает отзывы одним запросом с '
+            'авторами.\n'
+            + '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+
+    def test_03_unknown_title(self, client):
+        url = self.EXPORT_URL_TEMPLATE.format(title_id=10 ** 6)
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
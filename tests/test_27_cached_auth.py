@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27CachedAuthentication:
+
+    TITLES_URL = '/api/v1/titles/'
+    USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def get_token(self, client, user):
+        from users.utils import issue_confirmation_code
+
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username,
+            'confirmation_code': issue_confirmation_code(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['token']
+
+    def client_for(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def test_01_token_claims(self, client, moderator):
+        token = AccessToken(self.get_token(client, moderator))
+        assert (token['username'], token['role'], token['ver']) == (
+            moderator.username, moderator.role, moderator.token_version
+        ), (
+            f'Проверьте, что токен от `{self.URL_TOKEN}` содержит `username`, '
+            '`role` и версию токенов пользователя.'
+        )
+
+    def test_02_no_user_queries_when_cached(self, client, user):
+        user_client = self.client_for(self.get_token(client, user))
+        user_client.get(self.TITLES_URL)
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(self.TITLES_URL, data={})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert not any('users_user' in query['sql']
+                       for query in queries.captured_queries), (
+            'Проверьте, что аутентификация по JWT берёт пользователя из '
+            'кэша и не обращается к таблице пользователей.'
+        )
+
+    def test_03_role_change_revokes_tokens(self, client, admin_client,
+                                           user):
+        user_client = self.client_for(self.get_token(client, user))
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        url = self.USER_DETAIL_URL_TEMPLATE.format(username=user.username)
+        response = admin_client.patch(url, data={'role': 'moderator'})
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли выданные ранее токены '
+            'пользователя отклоняются.'
+        )
+        user.refresh_from_db()
+        new_client = self.client_for(self.get_token(client, user))
+        response = new_client.get('/api/v1/users/me/')
+        assert response.json()['role'] == 'moderator'
+
+    def test_04_deactivation_and_profile_edits(self, client, user):
+        user_client = self.client_for(self.get_token(client, user))
+        response = user_client.patch('/api/v1/users/me/',
+                                     data={'bio': 'new bio'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get('/api/v1/users/me/').json()['bio'] == (
+            'new bio'
+        ), (
+            'Проверьте, что правка профиля видна сразу, несмотря на кэш.'
+        )
+        user.is_active = False
+        user.save()
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токены деактивированного пользователя '
+            'отклоняются.'
+        )
+
+    def test_05_revocation_reaches_other_processes(self, client, user):
+        from django.conf import settings
+        from django.core.cache.backends.filebased import FileBasedCache
+
+        from users.authentication import principal_key
+
+        user_client = self.client_for(self.get_token(client, user))
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        # Отдельный экземпляр кэша — как у другого процесса на том же
+        # хосте.
+        other = FileBasedCache(
+            settings.CACHES[settings.AUTH_CACHE_ALIAS]['LOCATION'], {}
+        )
+        key = principal_key(user.pk, user.token_version)
+        assert other.get(key) is not None, (
+            'Проверьте, что пользователи для аутентификации кэшируются в '
+            'кэше, общем для всех процессов.'
+        )
+        user.is_active = False
+        user.save()
+        assert other.get(key) is None, (
+            'Проверьте, что деактивация убирает пользователя из кэша '
+            'аутентификации всех процессов, а не только текущего.'
+        )
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,155 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28MailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def queue(self, *recipients):
+        from mailer.outbox import queue_mail
+
+        return [
+            queue_mail('Subject', f'Body for {email}', [email])
+            for email in recipients
+        ]
+
+    def test_01_signup_queues_message(self, client, settings, smtp_server):
+        from jobs.worker import Worker
+        from mailer.models import OutboxMessage
+        from users.models import User
+        from users.utils import check_confirmation_code
+
+        settings.TASKS_ALWAYS_EAGER = False
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid-username'
+        })
+        assert response.status_code == HTTPStatus.OK
+        message = OutboxMessage.objects.get()
+        assert (message.status, message.to, smtp_server.connections) == (
+            OutboxMessage.PENDING, ['valid@yamdb.fake'], 0
+        ), (
+            f'Проверьте, что `{self.URL_SIGNUP}` кладёт письмо с кодом '
+            'в исходящую очередь, не обращаясь к SMTP.'
+        )
+
+        Worker(threads=1, poll_interval=0.01, name='test').run(burst=True)
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.SENT
+        recipients, body = smtp_server.messages[0]
+        assert recipients == ['valid@yamdb.fake']
+        code = body.strip().rsplit(' ', 1)[-1]
+        assert check_confirmation_code(User.objects.get(), code), (
+            'Проверьте, что письмо содержит код подтверждения.'
+        )
+
+    def test_02_batch_uses_single_connection(self, settings, smtp_server):
+        from mailer.models import OutboxMessage
+        from mailer.outbox import deliver_pending
+
+        settings.TASKS_ALWAYS_EAGER = False
+        self.queue(*(f'user{index}@yamdb.fake' for index in range(5)))
+
+        assert deliver_pending(batch_size=10) == (5, 0)
+        assert smtp_server.connections == 1, (
+            'Проверьте, что пачка писем отправляется через одно '
+            'SMTP-соединение.'
+        )
+        assert len(smtp_server.messages) == 5
+        assert not OutboxMessage.objects.exclude(
+            status=OutboxMessage.SENT
+        ).exists()
+
+    def test_03_failed_message_is_retried(self, settings, smtp_server):
+        from mailer.models import OutboxMessage
+        from mailer.outbox import deliver_pending
+
+        settings.TASKS_ALWAYS_EAGER = False
+        settings.MAIL_MAX_ATTEMPTS = 2
+        rejected, accepted = self.queue(
+            'reject@yamdb.fake', 'valid@yamdb.fake'
+        )
+        assert deliver_pending() == (1, 1)
+        rejected.refresh_from_db()
+        accepted.refresh_from_db()
+        assert accepted.status == OutboxMessage.SENT
+        assert (rejected.status, rejected.attempts) == (
+            OutboxMessage.PENDING, 1
+        ), (
+            'Проверьте, что неотправленное письмо остаётся в очереди.'
+        )
+        assert rejected.send_after > timezone.now(), (
+            'Проверьте, что повтор отправки откладывается.'
+        )
+        assert 'reject@yamdb.fake' in rejected.last_error
+
+        OutboxMessage.objects.filter(pk=rejected.pk).update(
+            send_after=timezone.now()
+        )
+        assert deliver_pending() == (0, 1)
+        rejected.refresh_from_db()
+        assert rejected.status == OutboxMessage.FAILED, (
+            'Проверьте, что после MAIL_MAX_ATTEMPTS попыток письмо '
+            'помечается как ошибочное.'
+        )
+
+    def test_04_unreachable_server_keeps_messages(self, settings):
+        from mailer.models import OutboxMessage
+        from mailer.outbox import deliver_pending
+
+        settings.TASKS_ALWAYS_EAGER = False
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        settings.EMAIL_PORT = 1
+        settings.EMAIL_TIMEOUT = 1
+        self.queue('first@yamdb.fake', 'second@yamdb.fake')
+
+        assert deliver_pending() == (0, 2)
+        states = set(OutboxMessage.objects.values_list('status', 'attempts'))
+        assert states == {(OutboxMessage.PENDING, 1)}, (
+            'Проверьте, что при недоступном SMTP письма остаются в очереди.'
+        )
+
+    def test_05_one_pending_delivery_job(self, settings):
+        from jobs.models import Job
+
+        settings.TASKS_ALWAYS_EAGER = False
+        self.queue(*(f'user{index}@yamdb.fake' for index in range(3)))
+        assert Job.objects.filter(status=Job.PENDING).count() == 1, (
+            'Проверьте, что письма, поставленные до запуска доставки, '
+            'не плодят задачи: их отправит одна ожидающая задача.'
+        )
+
+    def test_06_sent_messages_are_purged(self, settings, smtp_server):
+        from datetime import timedelta
+
+        from mailer.models import OutboxMessage
+        from mailer.outbox import deliver_pending, purge_outbox
+
+        settings.TASKS_ALWAYS_EAGER = False
+        old, recent = self.queue('old@yamdb.fake', 'recent@yamdb.fake')
+        pending, = self.queue('pending@yamdb.fake')
+        OutboxMessage.objects.filter(pk=pending.pk).update(
+            send_after=timezone.now() + timedelta(hours=1)
+        )
+        assert deliver_pending() == (2, 0)
+        assert set(OutboxMessage.objects.filter(
+            status=OutboxMessage.SENT
+        ).values_list('body', flat=True)) == {''}, (
+            'Проверьте, что текст отправленного письма с кодом '
+            'подтверждения не хранится в очереди.'
+        )
+        OutboxMessage.objects.filter(pk=old.pk).update(
+            sent_at=timezone.now() - timedelta(
+                seconds=settings.MAIL_RETENTION + 1)
+        )
+        assert purge_outbox() == 1
+        assert set(OutboxMessage.objects.values_list('pk', flat=True)) == {
+            recent.pk, pending.pk
+        }, (
+            'Проверьте, что `purge_outbox` удаляет только давно '
+            'отправленные письма.'
+        )
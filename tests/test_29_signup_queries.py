@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SignupQueries:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    DATA = {'email': 'valid@yamdb.fake', 'username': 'valid-username'}
+
+    TABLES = ('users_user', 'users_confirmationcode')
+
+    def statements(self, context):
+        """Запросы к таблицам пользователей и кодов: (команда, таблица)."""
+        return [
+            (query['sql'].split()[0], table)
+            for query in context.captured_queries
+            for table in self.TABLES
+            if f'"{table}"' in query['sql'].split(' WHERE ')[0]
+        ]
+
+    def signup(self, client, data):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK
+        return self.statements(context)
+
+    def mailed_code(self):
+        from django.core import mail
+
+        return mail.outbox[-1].body.rsplit(' ', 1)[-1]
+
+    def test_01_new_user_single_insert(self, client, django_user_model):
+        from users.utils import check_confirmation_code
+
+        statements = self.signup(client, self.DATA)
+        assert statements == [
+            ('SELECT', 'users_user'),
+            ('INSERT', 'users_user'),
+            ('INSERT', 'users_confirmationcode'),
+        ], (
+            f'Проверьте, что регистрация через `{self.URL_SIGNUP}` делает '
+            'одну выборку пользователя, один INSERT пользователя и один '
+            f'INSERT кода подтверждения. Запросы: {statements}'
+        )
+        assert check_confirmation_code(
+            django_user_model.objects.get(), self.mailed_code()
+        )
+
+    def test_02_repeat_signup_single_update(self, client,
+                                            django_user_model):
+        from users.utils import check_confirmation_code
+
+        client.post(self.URL_SIGNUP, data=self.DATA)
+        old_code = self.mailed_code()
+
+        statements = self.signup(client, self.DATA)
+        assert statements == [
+            ('SELECT', 'users_user'),
+            ('UPDATE', 'users_confirmationcode'),
+        ], (
+            f'Проверьте, что повторная регистрация через `{self.URL_SIGNUP}` '
+            'не пишет в таблицу пользователей и обновляет код одним '
+            f'UPDATE. Запросы: {statements}'
+        )
+        user = django_user_model.objects.get()
+        assert not check_confirmation_code(user, old_code), (
+            'Проверьте, что повторная регистрация заменяет прежний код.'
+        )
+        assert check_confirmation_code(user, self.mailed_code()), (
+            'Проверьте, что письмо содержит записанный код подтверждения.'
+        )
+
+    def test_03_conflicts_use_single_lookup(self, client, django_user_model):
+        django_user_model.objects.create(
+            username='taken', email='taken@yamdb.fake'
+        )
+        for data, field in (
+            ({'username': 'other', 'email': 'taken@yamdb.fake'}, 'email'),
+            ({'username': 'taken', 'email': 'other@yamdb.fake'}, 'username'),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.post(self.URL_SIGNUP, data=data)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert field in response.json()
+            assert len(context.captured_queries) == 1, (
+                f'Проверьте, что конфликт `{field}` при регистрации '
+                'определяется одним запросом.'
+            )
+
+    def test_04_concurrent_signup_race(self, django_user_model):
+        from users.serializers import SignUpSerializer
+        from users.utils import check_confirmation_code
+
+        first = SignUpSerializer(data=self.DATA)
+        second = SignUpSerializer(data=self.DATA)
+        assert first.is_valid() and second.is_valid()
+        first.save()
+
+        with CaptureQueriesContext(connection) as context:
+            user = second.save()
+        assert django_user_model.objects.count() == 1, (
+            'Проверьте, что параллельные регистрации одного пользователя '
+            'не создают дубликатов.'
+        )
+        assert self.statements(context) == [
+            ('INSERT', 'users_user'),
+            ('SELECT', 'users_user'),
+            ('UPDATE', 'users_confirmationcode'),
+        ]
+        assert check_confirmation_code(user, self.mailed_code()), (
+            'Проверьте, что проигравшая гонку регистрация выдаёт свой '
+            'код уже созданному пользователю.'
+        )
+
+    def test_05_concurrent_username_taken(self, django_user_model):
+        from rest_framework.exceptions import ValidationError
+        from users.serializers import SignUpSerializer
+
+        serializer = SignUpSerializer(data=self.DATA)
+        assert serializer.is_valid()
+        django_user_model.objects.create(
+            username=self.DATA['username'], email='other@yamdb.fake'
+        )
+        with pytest.raises(ValidationError) as error:
+            serializer.save()
+        assert 'username' in error.value.detail, (
+            'Проверьте, что регистрация, проигравшая гонку за username '
+            'другому email, возвращает ошибку валидации.'
+        )
@@ -0,0 +1,104 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30ConfirmationCodes:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def get_token(self, client, user, code):
+        return client.post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': code
+        })
+
+    def test_01_code_is_hashed(self, user):
+        from users.models import ConfirmationCode
+        from users.utils import issue_confirmation_code
+
+        code = issue_confirmation_code(user)
+        stored = ConfirmationCode.objects.get(user=user)
+        assert code not in stored.code_hash, (
+            'Проверьте, что код подтверждения хранится только хэшем.'
+        )
+        assert (
+            timezone.now() < stored.expires_at
+            <= timezone.now() + timedelta(hours=1)
+        ), 'Проверьте, что у кода подтверждения есть срок действия.'
+
+    def test_02_code_is_single_use(self, client, user):
+        from users.utils import issue_confirmation_code
+
+        code = issue_confirmation_code(user)
+        assert self.get_token(client, user, code).status_code == (
+            HTTPStatus.OK
+        )
+        assert self.get_token(client, user, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), (
+            f'Проверьте, что `{self.URL_TOKEN}` не выдаёт второй токен по '
+            'тому же коду подтверждения.'
+        )
+
+    def test_03_attempts_are_limited(self, client, user):
+        from users.constants import CONF_MAX_ATTEMPTS
+        from users.utils import issue_confirmation_code
+
+        code = issue_confirmation_code(user)
+        for _ in range(CONF_MAX_ATTEMPTS):
+            response = self.get_token(client, user, 'wrong')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert self.get_token(client, user, code).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что после исчерпания попыток ввод кода '
+            'подтверждения блокируется.'
+        )
+
+    def test_04_expired_code_rejected(self, client, user):
+        from users.models import ConfirmationCode
+        from users.utils import issue_confirmation_code
+
+        code = issue_confirmation_code(user)
+        ConfirmationCode.objects.filter(user=user).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert self.get_token(client, user, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что истёкший код подтверждения не принимается.'
+
+    def test_05_purge_expired_codes(self, user, admin):
+        from users.models import ConfirmationCode
+        from users.utils import issue_confirmation_code
+
+        for owner in (user, admin):
+            issue_confirmation_code(owner)
+        ConfirmationCode.objects.filter(user=user).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        call_command('purge_confirmation_codes', '--enqueue')
+        assert list(
+            ConfirmationCode.objects.values_list('user_id', flat=True)
+        ) == [admin.pk], (
+            'Проверьте, что задача очистки удаляет истёкшие коды и '
+            'оставляет действующие.'
+        )
+
+    def test_06_code_is_unpredictable(self):
+        import random
+
+        from users.utils import make_confirmation_code
+
+        codes = set()
+        for _ in range(2):
+            random.seed(0)
+            codes.add(make_confirmation_code())
+        assert len(codes) == 2, (
+            'Проверьте, что код подтверждения генерируется '
+            'криптографически стойким генератором, а не модулем `random`.'
+        )
@@ -0,0 +1,182 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+WRITES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31TokenThrottling:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @pytest.fixture
+    def rates(self, settings):
+        def set_rates(token='1000/minute', signup='1000/minute'):
+            settings.REST_FRAMEWORK = {
+                **settings.REST_FRAMEWORK,
+                'DEFAULT_THROTTLE_RATES': {
+                    'auth_token': token, 'auth_signup': signup,
+                },
+            }
+        return set_rates
+
+    def guess(self, client, user, attempts):
+        """Перебирает коды и возвращает статусы и число записей в БД."""
+        statuses = set()
+        with CaptureQueriesContext(connection) as context:
+            for attempt in range(attempts):
+                statuses.add(client.post(self.URL_TOKEN, data={
+                    'username': user.username,
+                    'confirmation_code': f'guess{attempt}',
+                }).status_code)
+        writes = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].lstrip().upper().startswith(WRITES)
+        ]
+        return statuses, writes
+
+    def test_01_write_volume_flat_under_attack(self, client, user, admin,
+                                               rates):
+        from users.utils import issue_confirmation_code
+
+        rates()
+        issue_confirmation_code(user)
+        issue_confirmation_code(admin)
+        for owner, attempts in ((user, 10), (admin, 100)):
+            statuses, writes = self.guess(client, owner, attempts)
+            assert writes == [], (
+                f'Проверьте, что перебор кодов на `{self.URL_TOKEN}` не '
+                f'пишет в БД: {attempts} попыток дали {len(writes)} '
+                'записей.'
+            )
+            assert statuses == {
+                HTTPStatus.BAD_REQUEST, HTTPStatus.TOO_MANY_REQUESTS
+            }
+
+    def test_02_exponential_lockout(self, user):
+        from users.constants import (CONF_LOCKOUT_MAX_SECONDS,
+                                     CONF_LOCKOUT_SECONDS, CONF_MAX_ATTEMPTS)
+        from users.throttling import (code_lockout, record_code_failure,
+                                      reset_code_failures)
+
+        for _ in range(CONF_MAX_ATTEMPTS - 1):
+            record_code_failure(user.pk)
+        assert code_lockout(user.pk) is None
+
+        waits = []
+        for _ in range(3):
+            record_code_failure(user.pk)
+            waits.append(round(code_lockout(user.pk)))
+        assert waits == [
+            CONF_LOCKOUT_SECONDS,
+            CONF_LOCKOUT_SECONDS * 2,
+            CONF_LOCKOUT_SECONDS * 4,
+        ], 'Проверьте, что каждая ошибка удваивает блокировку.'
+
+        for _ in range(20):
+            record_code_failure(user.pk)
+        assert round(code_lockout(user.pk)) == CONF_LOCKOUT_MAX_SECONDS
+
+        reset_code_failures(user.pk)
+        assert code_lockout(user.pk) is None
+
+    def test_03_success_resets_failures(self, client, user, rates):
+        from users.constants import CONF_MAX_ATTEMPTS
+        from users.throttling import code_lockout
+        from users.utils import issue_confirmation_code
+
+        rates()
+        code = issue_confirmation_code(user)
+        self.guess(client, user, CONF_MAX_ATTEMPTS - 1)
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username, 'confirmation_code': code
+        })
+        assert response.status_code == HTTPStatus.OK
+        self.guess(client, user, CONF_MAX_ATTEMPTS - 1)
+        assert code_lockout(user.pk) is None, (
+            'Проверьте, что успешный вход сбрасывает счётчик ошибок.'
+        )
+
+    def test_04_rate_throttles(self, client, user, rates):
+        from django.core.cache import caches
+
+        rates(token='3/minute', signup='2/minute')
+        responses = [
+            client.post(self.URL_SIGNUP, data={
+                'email': f'user{index}@yamdb.fake',
+                'username': f'user{index}',
+            }).status_code
+            for index in range(3)
+        ]
+        assert responses == [
+            HTTPStatus.OK, HTTPStatus.OK, HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            f'Проверьте, что частота запросов к `{self.URL_SIGNUP}` '
+            'ограничена.'
+        )
+        statuses, _ = self.guess(client, user, 4)
+        assert HTTPStatus.TOO_MANY_REQUESTS in statuses, (
+            f'Проверьте, что частота запросов к `{self.URL_TOKEN}` '
+            'ограничена.'
+        )
+        assert caches['shared'].get('throttle_auth_signup_127.0.0.1'), (
+            'Проверьте, что ограничения частоты хранятся в общем для '
+            'процессов кэше.'
+        )
+
+    def test_05_token_does_not_bypass_throttle(self, user_client, user,
+                                               rates):
+        rates(token='3/minute')
+        statuses = [
+            user_client.post(self.URL_TOKEN, data={
+                'username': user.username, 'confirmation_code': 'wrong'
+            }).status_code
+            for _ in range(4)
+        ]
+        assert statuses == [HTTPStatus.BAD_REQUEST] * 3 + [
+            HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            f'Проверьте, что запросы к `{self.URL_TOKEN}` с JWT-токеном '
+            'тоже ограничиваются по частоте.'
+        )
+
+    def test_06_concurrent_failures_are_not_lost(self, user, monkeypatch):
+        from django.core.cache import caches
+
+        from users import throttling
+        from users.constants import CONF_FAILURES_KEY
+
+        key = CONF_FAILURES_KEY.format(user_id=user.pk)
+        cache = caches['shared']
+
+        class Interleaved:
+            """Кэш, в котором после первого обращения к счётчику
+            параллельный запрос успевает записать свою ошибку."""
+
+            interleaved = False
+
+            def __getattr__(self, name):
+                method = getattr(cache, name)
+                if name not in ('get', 'add') or self.interleaved:
+                    return method
+
+                def call(*args, **kwargs):
+                    result = method(*args, **kwargs)
+                    self.interleaved = True
+                    if not cache.add(key, 1, 60):
+                        cache.incr(key)
+                    return result
+                return call
+
+        monkeypatch.setattr(
+            throttling, 'get_throttle_cache', lambda: Interleaved()
+        )
+        throttling.record_code_failure(user.pk)
+        assert cache.get(key) == 2, (
+            'Проверьте, что параллельные ошибки ввода кода не затирают '
+            'друг друга в счётчике.'
+        )
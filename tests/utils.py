@@ -1,5 +1,10 @@
+import re
 from http import HTTPStatus
 
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 check_name_and_slug_patterns = (
     (
         {
@@ -304,3 +309,61 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def check_query_count(client, url, populate):
+    """Проверяет, что число запросов к БД не зависит от размера страницы.
+
+    Кэши сбрасываются перед каждым замером, чтобы сравнивать запросы
+    при одинаково холодном кэше.
+    """
+    clear_caches()
+    with CaptureQueriesContext(connection) as before:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    populate()
+    clear_caches()
+    with CaptureQueriesContext(connection) as after:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert len(after) == len(before), (
+        f'Проверьте, что GET-запрос к `{url}` выполняет постоянное число '
+        f'запросов к БД: было {len(before)}, стало {len(after)}.\n'
+        + '\n'.join(query['sql'] for query in after.captured_queries)
+    )
+    return len(after)
+
+
+FULL_SCAN_PATTERNS = {
+    # Поиск FTS5 по MATCH (`VIRTUAL TABLE INDEX 0:M...`) — не просмотр.
+    'sqlite': re.compile(
+        r'\bSCAN (?:TABLE )?(\w+)\b(?! VIRTUAL TABLE INDEX \d+:M)'
+        r'( USING \w* ?INDEX)?'
+    ),
+    'postgresql': re.compile(r'Seq Scan on (\w+)()'),
+}
+
+
+def check_no_full_scan(queryset, description, allow_index_scan=False):
+    """Проверяет план запроса: полный просмотр таблиц недопустим.
+
+    Для SQLite разбирается `EXPLAIN QUERY PLAN`, для PostgreSQL — `EXPLAIN`.
+    Просмотр всего индекса в SQLite допускается только с
+    `allow_index_scan`: для списка без фильтров это чтение в порядке
+    сортировки до LIMIT.
+    """
+    plan = queryset.explain()
+    tables = []
+    for match in FULL_SCAN_PATTERNS[connection.vendor].finditer(plan):
+        table, by_index = match.group(1), bool(match.group(2))
+        if not (by_index and allow_index_scan):
+            tables.append(table)
+    assert not tables, (
+        f'Запрос {description} выполняет полный просмотр таблиц '
+        f'{", ".join(tables)}. Добавьте индекс.\n{queryset.query}\n{plan}'
+    )